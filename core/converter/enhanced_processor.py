@@ -14,11 +14,19 @@ import io
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from ..utils.cache_manager import CacheManager
+from ..utils.async_utils import run_sync
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One pool for PDF parsing shared by every processor instance, so modes
+# and cache directories do not each spin up cpu_count() threads
+_PDF_POOL = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1),
+    thread_name_prefix="pdf-parse"
+)
+
 class EnhancedProcessor:
     def __init__(self, cache_dir: str = ".cache"):
         """
@@ -28,7 +36,7 @@ class EnhancedProcessor:
             cache_dir: Directory for caching processed documents
         """
         self.cache_manager = CacheManager(cache_dir)
-        self.executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        self.executor = _PDF_POOL
         
     async def process_document(self, file_path: Union[str, Path], 
                              use_cache: bool = True) -> Dict:
@@ -55,7 +63,7 @@ class EnhancedProcessor:
                 return cached
                 
         # Process in thread pool
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         try:
             result = await loop.run_in_executor(
                 self.executor, 
@@ -348,6 +356,23 @@ class EnhancedProcessor:
             attributes.append("bold")
         return attributes
         
+    def process_document_sync(self, file_path: Union[str, Path],
+                              use_cache: bool = True) -> Dict:
+        """
+        Process PDF document from synchronous code.
+        
+        Runs process_document on the shared background event loop, so it
+        works whether or not the caller is inside a running loop.
+        
+        Args:
+            file_path: Path to PDF file
+            use_cache: Whether to use cache
+            
+        Returns:
+            Dictionary with processed content
+        """
+        return run_sync(self.process_document(file_path, use_cache))
+        
     async def process_batch(self, file_paths: List[Union[str, Path]], 
                           use_cache: bool = True) -> List[Dict]:
         """
@@ -3,15 +3,32 @@ DocMentor Core - Единый движок для работы с медицин
 Простая и понятная реализация без избыточной сложности.
 """
 
+import asyncio
+import atexit
+import hashlib
 import logging
+from collections import OrderedDict
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Tuple, Union
 import shutil
+import weakref
 
+import numpy as np
+
+from .converter.enhanced_processor import EnhancedProcessor
+from .utils.file_utils import fast_copy
 from .vector_store import FAISSStore
 
 logger = logging.getLogger(__name__)
 
+# uvloop (optional) - более быстрый цикл событий для асинхронной обработки PDF
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
 # LLM imports (optional - only if llama-cpp-python is installed)
 try:
     from .llm import LLMManager, RAGPipeline
@@ -20,6 +37,53 @@ except ImportError:
     LLM_AVAILABLE = False
     logger.info("LLM module not available. Install llama-cpp-python for AI features.")
 
+# Экземпляры с несохраненными изменениями; ссылки слабые, чтобы отложенное
+# сохранение не удерживало в памяти индекс и модель эмбеддингов
+_DIRTY_CORES: "weakref.WeakSet[DocMentorCore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_dirty_cores():
+    """Сохранить при завершении процесса все экземпляры с несохраненными изменениями."""
+    for core in list(_DIRTY_CORES):
+        try:
+            core.flush()
+        except Exception as e:
+            logger.error(f"Error saving vector store at exit: {str(e)}")
+
+
+@lru_cache(maxsize=16)
+def _dir_names(path: str, mtime_ns: int, pattern: str) -> Tuple[str, ...]:
+    """
+    Имена файлов каталога, подходящих под шаблон.
+
+    Кэшируется по mtime каталога: при добавлении или удалении файлов
+    mtime меняется и список перечитывается.
+    """
+    return tuple(sorted(file_path.name for file_path in Path(path).glob(pattern)))
+
+
+def _list_dir(path: Path, pattern: str) -> Tuple[Tuple[str, int], ...]:
+    """
+    Листинг каталога в виде пар (имя файла, размер); пустой, если каталога нет.
+
+    Кэшируется только список имён: перезапись файла на месте не меняет mtime
+    каталога, поэтому размеры читаются заново при каждом вызове.
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return ()
+
+    listing = []
+    for name in _dir_names(str(path), mtime_ns, pattern):
+        file_path = path / name
+        try:
+            listing.append((name, file_path.stat().st_size))
+        except OSError as e:
+            logger.error(f"Error getting info for {file_path}: {str(e)}")
+    return tuple(listing)
+
 
 class DocMentorCore:
     """
@@ -27,6 +91,20 @@ class DocMentorCore:
     Управляет документами, поиском и AI-ассистентом.
     """
 
+    # Сколько документов обрабатывается между сохранениями индекса на диск
+    # (как BaseMode.SAVE_EVERY)
+    SAVE_EVERY = 16
+
+    # Кэш ответов AI по точному тексту вопроса
+    ANSWER_CACHE_SIZE = 256
+
+    # Повторное использование ответа на похожий вопрос (косинусная близость
+    # не ниже порога). По умолчанию выключено: перефразировки, отличающиеся
+    # одним термином (препарат, "дети"/"взрослые"), бывают близки почти
+    # до 1, и пользователь получил бы ответ на другой вопрос
+    SEMANTIC_ANSWER_CACHE = False
+    SEMANTIC_CACHE_THRESHOLD = 0.95
+
     def __init__(
         self,
         storage_path: Union[str, Path] = "./data",
@@ -47,6 +125,20 @@ class DocMentorCore:
         self.model_name = model_name
         self.vector_store = self._initialize_vector_store()
 
+        # Отложенное сохранение: индекс пишется раз в SAVE_EVERY документов
+        # и при завершении процесса
+        self._dirty = False
+        self._docs_since_save = 0
+
+        # Собственный цикл событий для асинхронного процессора
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Кэш ответов: ключ (хэш вопроса, версия индекса, параметры генерации),
+        # значение (нормализованный эмбеддинг вопроса или None, ответ). Версия растет при каждом
+        # добавлении документов, поэтому старые ответы не переиспользуются
+        self._index_version = 0
+        self._answer_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
         # LLM integration
         self.llm_manager = None
         self.rag_pipeline = None
@@ -110,24 +202,18 @@ class DocMentorCore:
 
         target_path = doc_storage / file_path.name
         if not target_path.exists():
-            shutil.copy2(file_path, target_path)
+            fast_copy(file_path, target_path)
             logger.info(f"Document copied to {target_path}")
 
         # Обрабатываем документ
         try:
-            from .converter.enhanced_processor import EnhancedProcessor
-
-            processor = EnhancedProcessor(cache_dir=str(self.storage_path / "cache"))
+            processor = self._processor
 
             # Обработка асинхронного метода синхронно
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+            if self._loop is None or self._loop.is_closed():
+                self._loop = _new_event_loop()
 
-            doc_data = loop.run_until_complete(
+            doc_data = self._loop.run_until_complete(
                 processor.process_document(target_path, use_cache=True)
             )
 
@@ -148,10 +234,18 @@ class DocMentorCore:
                 "author": doc_data.get("metadata", {}).get("author", ""),
             })
 
-            # Добавляем в векторное хранилище
-            chunk_metadata = [metadata.copy() for _ in chunks]
-            self.vector_store.add_texts(chunks, chunk_metadata)
-            self.save()
+            # Добавляем в векторное хранилище: все фрагменты документа
+            # ссылаются на одну копию метаданных
+            self.vector_store.add_texts(chunks, dict(metadata))
+            self._index_version += 1
+            if self.rag_pipeline:
+                self.rag_pipeline.clear_search_cache()
+
+            self._dirty = True
+            self._docs_since_save += 1
+            _DIRTY_CORES.add(self)
+            if self._docs_since_save >= self.SAVE_EVERY:
+                self.save()
 
             logger.info(f"Successfully processed {file_path.name}: {len(chunks)} chunks")
 
@@ -166,6 +260,11 @@ class DocMentorCore:
             logger.error(f"Error processing document {file_path}: {str(e)}")
             raise
 
+    @cached_property
+    def _processor(self) -> EnhancedProcessor:
+        """Процессор PDF, общий для всех документов."""
+        return EnhancedProcessor(cache_dir=str(self.storage_path / "cache"))
+
     def search(
         self,
         query: str,
@@ -188,14 +287,7 @@ class DocMentorCore:
             results = self.vector_store.similarity_search(query, k=k, filter_dict=filter_dict)
 
             # Форматируем результаты
-            formatted_results = []
-            for text, metadata, score in results:
-                formatted_results.append({
-                    "text": text,
-                    "metadata": metadata,
-                    "score": float(score),
-                    "source": metadata.get("filename", "Unknown")
-                })
+            formatted_results = self._format_results(results)
 
             logger.info(f"Search '{query}' returned {len(formatted_results)} results")
             return formatted_results
@@ -204,6 +296,49 @@ class DocMentorCore:
             logger.error(f"Error during search: {str(e)}")
             raise
 
+    def batch_search(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filter_dict: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """
+        Поиск сразу по нескольким запросам.
+
+        Все запросы кодируются одним вызовом модели и ищутся одним
+        обращением к FAISS, который распределяет их по ядрам.
+
+        Args:
+            queries: Поисковые запросы
+            k: Количество результатов на запрос
+            filter_dict: Фильтры по метаданным
+
+        Returns:
+            Список результатов для каждого запроса
+        """
+        try:
+            batch_results = self.vector_store.similarity_search_batch(
+                queries, k=k, filter_dict=filter_dict
+            )
+            return [self._format_results(results) for results in batch_results]
+
+        except Exception as e:
+            logger.error(f"Error during batch search: {str(e)}")
+            raise
+
+    @staticmethod
+    def _format_results(results) -> List[Dict]:
+        """Форматирование результатов поиска."""
+        return [
+            {
+                "text": text,
+                "metadata": metadata,
+                "score": float(score),
+                "source": metadata.get("filename", "Unknown")
+            }
+            for text, metadata, score in results
+        ]
+
     def get_documents(self) -> List[Dict]:
         """
         Получить список загруженных документов.
@@ -212,23 +347,15 @@ class DocMentorCore:
             Список документов с метаданными
         """
         doc_storage = self.storage_path / "documents"
-        if not doc_storage.exists():
-            return []
-
-        documents = []
-        for file_path in doc_storage.glob("*.pdf"):
-            try:
-                doc_info = {
-                    "filename": file_path.name,
-                    "size_mb": round(file_path.stat().st_size / (1024 * 1024), 2),
-                    "path": str(file_path)
-                }
-                documents.append(doc_info)
-            except Exception as e:
-                logger.error(f"Error getting info for {file_path}: {str(e)}")
-                continue
 
-        return documents
+        return [
+            {
+                "filename": name,
+                "size_mb": round(size / (1024 * 1024), 2),
+                "path": str(doc_storage / name)
+            }
+            for name, size in _list_dir(doc_storage, "*.pdf")
+        ]
 
     def get_stats(self) -> Dict:
         """
@@ -238,7 +365,7 @@ class DocMentorCore:
             Статистика (количество документов, фрагментов и т.д.)
         """
         return {
-            "total_documents": len(self.get_documents()),
+            "total_documents": len(_list_dir(self.storage_path / "documents", "*.pdf")),
             "total_chunks": len(self.vector_store.texts),
             "storage_path": str(self.storage_path),
             "model_name": self.model_name
@@ -248,17 +375,26 @@ class DocMentorCore:
         """Очистить кэш обработанных документов."""
         cache_path = self.storage_path / "cache"
         if cache_path.exists():
-            import shutil
             shutil.rmtree(cache_path)
             cache_path.mkdir(parents=True, exist_ok=True)
+            # Процессор держит кэш в удаленном каталоге - пересоздаем
+            self.__dict__.pop("_processor", None)
             logger.info("Cache cleared")
 
     def save(self):
         """Сохранить текущее состояние векторного хранилища."""
         store_path = self.storage_path / "vector_store"
         self.vector_store.save_local(str(store_path))
+        self._dirty = False
+        self._docs_since_save = 0
+        _DIRTY_CORES.discard(self)
         logger.info(f"Vector store saved to {store_path}")
 
+    def flush(self):
+        """Сохранить хранилище, если есть несохраненные изменения."""
+        if self._dirty:
+            self.save()
+
     # ==================== LLM Methods ====================
 
     def _initialize_llm(self, model_path: Optional[str] = None):
@@ -276,11 +412,10 @@ class DocMentorCore:
             # Auto-detect model if not provided
             if not model_path:
                 models_dir = Path("./models")
-                if models_dir.exists():
-                    gguf_files = list(models_dir.glob("*.gguf"))
-                    if gguf_files:
-                        model_path = str(gguf_files[0])
-                        logger.info(f"Auto-detected model: {model_path}")
+                gguf_files = _list_dir(models_dir, "*.gguf")
+                if gguf_files:
+                    model_path = str(models_dir / gguf_files[0][0])
+                    logger.info(f"Auto-detected model: {model_path}")
 
             if model_path and Path(model_path).exists():
                 self.llm_manager = LLMManager(
@@ -335,13 +470,67 @@ class DocMentorCore:
                 "answer": ""
             }
 
-        return self.rag_pipeline.answer_question(
+        version = (self._index_version, use_context, max_tokens, temperature)
+        key = (hashlib.blake2b(question.encode("utf-8"), digest_size=16).digest(), *version)
+
+        # Точное совпадение вопроса
+        cached = self._answer_cache.get(key)
+        if cached is not None:
+            self._answer_cache.move_to_end(key)
+            return {**cached[1], "cached": True}
+
+        # Почти такой же вопрос, заданный ранее (только если включено).
+        # Эмбеддинг считается один раз и передается в поиск контекста
+        embedding = unit_embedding = None
+        if self.SEMANTIC_ANSWER_CACHE:
+            embedding = self.vector_store.model.encode([question])[0]
+            unit_embedding = embedding / (np.linalg.norm(embedding) or 1.0)
+            cached = self._find_similar_answer(unit_embedding, version)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+        result = self.rag_pipeline.answer_question(
             question=question,
             use_context=use_context,
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            query_embedding=embedding
         )
 
+        if result.get("status") == "success":
+            self._answer_cache[key] = (unit_embedding, result)
+            if len(self._answer_cache) > self.ANSWER_CACHE_SIZE:
+                self._answer_cache.popitem(last=False)
+
+        return result
+
+    def _find_similar_answer(self, embedding: np.ndarray, version: tuple) -> Optional[Dict]:
+        """
+        Найти в кэше ответ на семантически близкий вопрос.
+
+        Args:
+            embedding: Нормализованный эмбеддинг вопроса
+            version: Версия индекса и параметры генерации
+
+        Returns:
+            Ответ из кэша или None
+        """
+        candidates = [
+            (key, value) for key, value in self._answer_cache.items()
+            if key[1:] == version and value[0] is not None
+        ]
+        if not candidates:
+            return None
+
+        similarities = np.stack([value[0] for _, value in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.SEMANTIC_CACHE_THRESHOLD:
+            return None
+
+        key, (_, result) = candidates[best]
+        self._answer_cache.move_to_end(key)
+        return result
+
     def explain_term(self, term: str) -> Dict:
         """
         Объяснить медицинский термин через AI.
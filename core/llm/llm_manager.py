@@ -4,10 +4,13 @@ Handles model loading, generation, and resource management.
 """
 
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Iterator, Optional, Dict, List, Tuple, Union
 import json
 
+from .prompt_templates import PromptTemplates
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +47,11 @@ class LLMManager:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.llm = None
+        # Token IDs of static prompt segments (system prompts, assistant
+        # header) are computed once and spliced into every chat prompt
+        self._tokenize_cached = lru_cache(maxsize=32)(self._tokenize)
+        # Tokens currently held in the KV cache as a known prefix
+        self._kv_tokens: Tuple[int, ...] = ()
         self._stats = {
             "total_requests": 0,
             "total_tokens_generated": 0,
@@ -98,6 +106,8 @@ class LLMManager:
                 n_gpu_layers=n_gpu_layers,
                 verbose=False
             )
+            self._tokenize_cached.cache_clear()
+            self._warm_prompt_cache()
 
             logger.info("✅ Model loaded successfully!")
             logger.info(f"   Context window: {self.n_ctx}")
@@ -112,7 +122,7 @@ class LLMManager:
 
     def generate(
         self,
-        prompt: str,
+        prompt: Union[str, List[int]],
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         stop: Optional[List[str]] = None
@@ -121,7 +131,7 @@ class LLMManager:
         Generate text from prompt.
 
         Args:
-            prompt: Input prompt
+            prompt: Input prompt (text or token IDs)
             max_tokens: Override default max_tokens
             temperature: Override default temperature
             stop: Stop sequences
@@ -144,7 +154,8 @@ class LLMManager:
             max_tokens = max_tokens or self.max_tokens
             temperature = temperature or self.temperature
 
-            # Generate
+            # Generate; llama.cpp reuses the KV cache for any shared prefix
+            self._kv_tokens = tuple(prompt) if isinstance(prompt, list) else ()
             response = self.llm(
                 prompt,
                 max_tokens=max_tokens,
@@ -205,8 +216,10 @@ class LLMManager:
         Returns:
             Dictionary with generated response
         """
-        # Format messages into prompt
-        prompt = self._format_chat_prompt(messages)
+        # Format messages into prompt; a follow-up turn shares its token
+        # prefix with the previous one, and llama.cpp's generate() only
+        # evaluates the tokens past the prefix already in the KV cache
+        prompt = self._format_chat_tokens(messages)
 
         # Generate
         return self.generate(
@@ -215,6 +228,99 @@ class LLMManager:
             temperature=temperature
         )
 
+    def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Chat-style generation that yields text chunks as they are produced.
+
+        Args:
+            messages: List of {"role": "user/assistant/system", "content": "..."}
+            max_tokens: Override default max_tokens
+            temperature: Override default temperature
+
+        Yields:
+            Generated text deltas (roughly one token each)
+
+        Raises:
+            RuntimeError: If the model is not loaded
+        """
+        if self.llm is None:
+            raise RuntimeError("Model not loaded. Call load_model() first.")
+
+        import time
+        start_time = time.time()
+
+        prompt = self._format_chat_tokens(messages)
+        self._kv_tokens = tuple(prompt) if isinstance(prompt, list) else ()
+
+        tokens_generated = 0
+        for chunk in self.llm(
+            prompt,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=temperature or self.temperature,
+            stop=["User:", "Студент:", "\n\n\n"],
+            echo=False,
+            stream=True
+        ):
+            text = chunk['choices'][0]['text']
+            if text:
+                tokens_generated += 1
+                yield text
+
+        elapsed = time.time() - start_time
+        self._stats['total_requests'] += 1
+        self._stats['total_tokens_generated'] += tokens_generated
+        logger.info(f"Streamed {tokens_generated} chunks in {elapsed:.2f}s")
+
+    def prefill(self, messages: List[Dict[str, str]]) -> bool:
+        """
+        Evaluate a prompt prefix into the KV cache ahead of generation.
+
+        The last message is treated as an unfinished turn (no end tag), so a
+        later chat() whose prompt starts with the same text only has to
+        evaluate the remainder. Safe to call from a worker thread as long
+        as no generation runs concurrently.
+
+        Args:
+            messages: Prompt prefix, e.g. PromptTemplates.question_answering_prefix()
+
+        Returns:
+            True if the prefix is in the KV cache
+        """
+        if self.llm is None or not messages:
+            return False
+
+        try:
+            tokens: List[int] = []
+            for i, msg in enumerate(messages[:-1]):
+                role = msg.get("role", "user")
+                tokenize = self._tokenize_cached if role == "system" else self._tokenize
+                tokens.extend(tokenize(self._chat_segment(role, msg.get("content", "")), i == 0))
+
+            last = messages[-1]
+            tokens.extend(self._tokenize(
+                f"<|im_start|>{last.get('role', 'user')}\n{last.get('content', '')}",
+                len(messages) == 1
+            ))
+
+            # Already evaluated by a previous prefill or generation
+            if self._kv_tokens[:len(tokens)] == tuple(tokens):
+                return True
+
+            self.llm.reset()
+            self.llm.eval(tokens)
+            self._kv_tokens = tuple(tokens)
+            return True
+
+        except Exception as e:
+            logger.debug(f"Prefill failed: {str(e)}")
+            self._kv_tokens = ()
+            return False
+
     def _format_chat_prompt(self, messages: List[Dict[str, str]]) -> str:
         """
         Format messages into Qwen2.5 chat format.
@@ -226,17 +332,61 @@ class LLMManager:
         What is asthma?<|im_end|>
         <|im_start|>assistant
         """
-        formatted = ""
-
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            formatted += f"<|im_start|>{role}\n{content}<|im_end|>\n"
+        parts = [
+            self._chat_segment(msg.get("role", "user"), msg.get("content", ""))
+            for msg in messages
+        ]
 
         # Add assistant turn
-        formatted += "<|im_start|>assistant\n"
+        parts.append("<|im_start|>assistant\n")
 
-        return formatted
+        return "".join(parts)
+
+    def _format_chat_tokens(self, messages: List[Dict[str, str]]) -> Union[str, List[int]]:
+        """
+        Format messages into Qwen2.5 chat format as token IDs.
+
+        System messages and the assistant header are static across calls,
+        so their token IDs come from a cache; only the dynamic user and
+        assistant turns are tokenized per call. Falls back to the text
+        prompt if the model cannot tokenize.
+        """
+        if self.llm is None:
+            return self._format_chat_prompt(messages)
+
+        try:
+            tokens: List[int] = []
+            for i, msg in enumerate(messages):
+                role = msg.get("role", "user")
+                segment = self._chat_segment(role, msg.get("content", ""))
+                tokenize = self._tokenize_cached if role == "system" else self._tokenize
+                tokens.extend(tokenize(segment, i == 0))
+
+            tokens.extend(self._tokenize_cached("<|im_start|>assistant\n", not messages))
+            return tokens
+
+        except Exception as e:
+            logger.debug(f"Token-level prompt assembly failed, using text prompt: {str(e)}")
+            return self._format_chat_prompt(messages)
+
+    def _warm_prompt_cache(self):
+        """Tokenize the built-in PromptTemplates.SYSTEM_* prompts up front."""
+        for name in dir(PromptTemplates):
+            if name.startswith("SYSTEM_"):
+                segment = self._chat_segment("system", getattr(PromptTemplates, name))
+                try:
+                    self._tokenize_cached(segment, True)
+                except Exception as e:
+                    logger.debug(f"Could not pre-tokenize {name}: {str(e)}")
+
+    @staticmethod
+    def _chat_segment(role: str, content: str) -> str:
+        """One Qwen2.5 chat turn."""
+        return f"<|im_start|>{role}\n{content}<|im_end|>\n"
+
+    def _tokenize(self, text: str, add_bos: bool = False) -> Tuple[int, ...]:
+        """Tokenize a prompt segment, keeping chat special tokens intact."""
+        return tuple(self.llm.tokenize(text.encode("utf-8"), add_bos=add_bos, special=True))
 
     def get_stats(self) -> Dict:
         """Get generation statistics."""
@@ -255,6 +405,8 @@ class LLMManager:
         if self.llm:
             del self.llm
             self.llm = None
+            self._kv_tokens = ()
+            self._tokenize_cached.cache_clear()
             logger.info("Model unloaded from memory")
 
     def __repr__(self):
@@ -86,46 +86,42 @@ class ModelDownloader:
         logger.info(f"   This may take a while...")
 
         try:
-            # Check if huggingface-cli is installed
-            import shutil
-            if shutil.which("huggingface-cli") is None:
-                logger.error("huggingface-cli not found")
-                logger.info("Install with: pip install huggingface-hub[cli]")
-                return None
+            from huggingface_hub import constants, hf_hub_download
+        except ImportError:
+            logger.error("huggingface-hub not installed")
+            logger.info("Install with: pip install huggingface-hub")
+            return None
 
-            # Download using huggingface-cli
-            cmd = [
-                "huggingface-cli",
-                "download",
-                repo,
-                filename,
-                "--local-dir",
-                str(self.models_dir),
-                "--local-dir-use-symlinks", "False"
-            ]
-
-            logger.info(f"Running: {' '.join(cmd)}")
-
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True
-            )
-
-            if local_path.exists():
-                logger.info(f"✅ Successfully downloaded to {local_path}")
-                return local_path
+        # Parallel chunked download when hf-transfer is available; the hub
+        # flag is process-wide, so it is only switched on for this download
+        use_hf_transfer = constants.HF_HUB_ENABLE_HF_TRANSFER
+        try:
+            import hf_transfer  # noqa: F401
+            use_hf_transfer = True
+        except ImportError:
+            logger.info("hf-transfer not installed, using single-stream download")
+
+        try:
+            previous = constants.HF_HUB_ENABLE_HF_TRANSFER
+            constants.HF_HUB_ENABLE_HF_TRANSFER = use_hf_transfer
+            try:
+                downloaded = hf_hub_download(
+                    repo_id=repo,
+                    filename=filename,
+                    local_dir=str(self.models_dir)
+                )
+            finally:
+                constants.HF_HUB_ENABLE_HF_TRANSFER = previous
+
+            if Path(downloaded).exists():
+                logger.info(f"✅ Successfully downloaded to {downloaded}")
+                return Path(downloaded)
             else:
                 logger.error("Download completed but file not found")
                 return None
 
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Download failed: {e}")
-            logger.error(f"stderr: {e.stderr}")
-            return None
         except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
+            logger.error(f"Download failed: {str(e)}")
             return None
 
     def get_model_path(self, model_key: str) -> Optional[Path]:
@@ -169,7 +165,8 @@ class ModelDownloader:
 
         packages = [
             "llama-cpp-python",
-            "huggingface-hub[cli]"
+            "huggingface-hub",
+            "hf-transfer"
         ]
 
         try:
@@ -2,9 +2,126 @@
 Prompt Templates - Specialized prompts for medical education contexts.
 """
 
+from string import Template
 from typing import List, Dict
 
 
+_NL = "\n"
+_CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+
+def _bullet_list(items) -> str:
+    """Render items as a "- item" list, one per line."""
+    return _NL.join(f"- {item}" for item in items)
+
+
+# User message skeletons, parsed once at import; only the fields change per call
+# Static opening of the RAG user message; lets the LLM prefill it while retrieval runs
+_QA_HEADER = """На основе следующих фрагментов из медицинских учебников ответь на вопрос студента.
+
+КОНТЕКСТ ИЗ УЧЕБНИКОВ:
+"""
+
+_QA_TEMPLATE = Template(_QA_HEADER + """$context
+
+ВОПРОС СТУДЕНТА:
+$question
+
+ИНСТРУКЦИИ:
+1. Используй только информацию из предоставленных фрагментов
+2. Дай точный и понятный ответ
+3. Объясни сложные термины
+4. Если информации недостаточно - честно скажи об этом
+5. Структурируй ответ с подзаголовками если нужно
+
+ОТВЕТ:""")
+
+_EXPLAIN_TERM_TEMPLATE = Template("""Объясни медицинский термин: **$term**
+
+$context
+
+Объясни:
+1. Что это значит простыми словами
+2. Этимология (происхождение термина)
+3. Синонимы если есть
+4. Пример использования в клинической практике
+
+Ответ должен быть понятен студенту 5 курса медицинского университета.""")
+
+_PATIENT_TEMPLATE = Template("""ТЫ ИГРАЕШЬ РОЛЬ ПАЦИЕНТА:
+- Имя: $name
+- Возраст: $age лет
+- Пол: $gender
+
+ТВОИ СИМПТОМЫ:
+$symptoms
+
+ТВОЯ ИСТОРИЯ:
+$history
+
+ВАЖНО: Отвечай как обычный человек, не как врач. Используй разговорный язык.""")
+
+_DIFFERENTIAL_TEMPLATE = Template("""СИМПТОМЫ ПАЦИЕНТА:
+$symptoms
+
+КОНТЕКСТ ИЗ УЧЕБНИКОВ:
+$context
+
+ЗАДАЧА:
+Проведи дифференциальную диагностику.
+
+Структура ответа:
+1. **Наиболее вероятный диагноз** (с обоснованием)
+2. **Дифференциальный ряд** (2-3 альтернативных диагноза)
+3. **Необходимые обследования** для подтверждения
+4. **"Красные флаги"** - что нельзя пропустить
+
+Рассуждай как опытный клиницист, обучай студента методу мышления.""")
+
+_CHECK_ANSWER_TEMPLATE = Template("""ВОПРОС:
+$question
+
+ОТВЕТ СТУДЕНТА:
+$student_answer
+
+ПРАВИЛЬНЫЙ ОТВЕТ:
+$correct_answer
+
+ЗАДАЧА:
+Оцени ответ студента и дай обратную связь.
+
+Структура:
+1. **Оценка** (правильно/частично правильно/неправильно)
+2. **Что верно** в ответе студента
+3. **Что упущено или неверно**
+4. **Объяснение** правильного ответа
+5. **Советы** для лучшего запоминания
+
+Будь конструктивным и поддерживающим.""")
+
+_SUMMARIZE_CASE_TEMPLATE = Template("""КЛИНИЧЕСКИЙ СЛУЧАЙ:
+
+Пациент: $name, $age лет
+
+Жалобы:
+$complaints
+
+Анамнез:
+$history
+
+Объективно:
+$physical_exam
+
+ЗАДАЧА:
+Составь краткое медицинское резюме этого случая для учебных целей.
+
+Структура:
+1. **Краткое описание** (2-3 предложения)
+2. **Ключевые находки**
+3. **Предполагаемый диагноз**
+4. **Учебные моменты** (что важно запомнить)""")
+
+
 class PromptTemplates:
     """
     Collection of prompt templates for different medical tasks.
@@ -48,6 +165,11 @@ class PromptTemplates:
 
 Стиль: строгий но справедливый преподаватель."""
 
+    # System messages are immutable and shared by every prompt built below
+    _MEDICAL_ASSISTANT_MESSAGE = {"role": "system", "content": SYSTEM_MEDICAL_ASSISTANT}
+    _VIRTUAL_PATIENT_MESSAGE = {"role": "system", "content": SYSTEM_VIRTUAL_PATIENT}
+    _EXAM_TUTOR_MESSAGE = {"role": "system", "content": SYSTEM_EXAM_TUTOR}
+
     @staticmethod
     def question_answering(question: str, context_chunks: List[str]) -> List[Dict[str, str]]:
         """
@@ -61,31 +183,32 @@ class PromptTemplates:
             Formatted messages for chat
         """
         # Format context
-        context = "\n\n---\n\n".join([
+        context = _CONTEXT_SEPARATOR.join(
             f"[Фрагмент {i+1}]\n{chunk}"
             for i, chunk in enumerate(context_chunks)
-        ])
-
-        user_message = f"""На основе следующих фрагментов из медицинских учебников ответь на вопрос студента.
+        )
 
-КОНТЕКСТ ИЗ УЧЕБНИКОВ:
-{context}
+        user_message = _QA_TEMPLATE.substitute(context=context, question=question)
 
-ВОПРОС СТУДЕНТА:
-{question}
+        return [
+            PromptTemplates._MEDICAL_ASSISTANT_MESSAGE,
+            {"role": "user", "content": user_message}
+        ]
 
-ИНСТРУКЦИИ:
-1. Используй только информацию из предоставленных фрагментов
-2. Дай точный и понятный ответ
-3. Объясни сложные термины
-4. Если информации недостаточно - честно скажи об этом
-5. Структурируй ответ с подзаголовками если нужно
+    @staticmethod
+    def question_answering_prefix() -> List[Dict[str, str]]:
+        """
+        Static prefix of question_answering() messages.
 
-ОТВЕТ:"""
+        The last message is the opening of the user turn, before the
+        retrieved context; it can be prefilled ahead of retrieval.
 
+        Returns:
+            Messages whose last entry is an unfinished user turn
+        """
         return [
-            {"role": "system", "content": PromptTemplates.SYSTEM_MEDICAL_ASSISTANT},
-            {"role": "user", "content": user_message}
+            PromptTemplates._MEDICAL_ASSISTANT_MESSAGE,
+            {"role": "user", "content": _QA_HEADER}
         ]
 
     @staticmethod
@@ -100,20 +223,13 @@ class PromptTemplates:
         Returns:
             Formatted messages
         """
-        user_message = f"""Объясни медицинский термин: **{term}**
-
-{"Контекст из учебника:\n" + context if context else ""}
-
-Объясни:
-1. Что это значит простыми словами
-2. Этимология (происхождение термина)
-3. Синонимы если есть
-4. Пример использования в клинической практике
-
-Ответ должен быть понятен студенту 5 курса медицинского университета."""
+        user_message = _EXPLAIN_TERM_TEMPLATE.substitute(
+            term=term,
+            context="Контекст из учебника:" + _NL + context if context else ""
+        )
 
         return [
-            {"role": "system", "content": PromptTemplates.SYSTEM_MEDICAL_ASSISTANT},
+            PromptTemplates._MEDICAL_ASSISTANT_MESSAGE,
             {"role": "user", "content": user_message}
         ]
 
@@ -135,20 +251,15 @@ class PromptTemplates:
             Formatted messages
         """
         # Format patient data
-        patient_desc = f"""ТЫ ИГРАЕШЬ РОЛЬ ПАЦИЕНТА:
-- Имя: {patient_info.get('name', 'Иван')}
-- Возраст: {patient_info.get('age', 35)} лет
-- Пол: {patient_info.get('gender', 'мужской')}
+        patient_desc = _PATIENT_TEMPLATE.substitute(
+            name=patient_info.get('name', 'Иван'),
+            age=patient_info.get('age', 35),
+            gender=patient_info.get('gender', 'мужской'),
+            symptoms=_bullet_list(patient_info.get('symptoms', [])),
+            history=patient_info.get('history', 'Не указано')
+        )
 
-ТВОИ СИМПТОМЫ:
-{chr(10).join(f"- {s}" for s in patient_info.get('symptoms', []))}
-
-ТВОЯ ИСТОРИЯ:
-{patient_info.get('history', 'Не указано')}
-
-ВАЖНО: Отвечай как обычный человек, не как врач. Используй разговорный язык."""
-
-        messages = [{"role": "system", "content": PromptTemplates.SYSTEM_VIRTUAL_PATIENT}]
+        messages = [PromptTemplates._VIRTUAL_PATIENT_MESSAGE]
 
         # Add patient description
         messages.append({"role": "system", "content": patient_desc})
@@ -177,28 +288,13 @@ class PromptTemplates:
         Returns:
             Formatted messages
         """
-        symptoms_list = "\n".join(f"- {s}" for s in symptoms)
-        context = "\n\n---\n\n".join(context_chunks)
-
-        user_message = f"""СИМПТОМЫ ПАЦИЕНТА:
-{symptoms_list}
-
-КОНТЕКСТ ИЗ УЧЕБНИКОВ:
-{context}
-
-ЗАДАЧА:
-Проведи дифференциальную диагностику.
-
-Структура ответа:
-1. **Наиболее вероятный диагноз** (с обоснованием)
-2. **Дифференциальный ряд** (2-3 альтернативных диагноза)
-3. **Необходимые обследования** для подтверждения
-4. **"Красные флаги"** - что нельзя пропустить
-
-Рассуждай как опытный клиницист, обучай студента методу мышления."""
+        user_message = _DIFFERENTIAL_TEMPLATE.substitute(
+            symptoms=_bullet_list(symptoms),
+            context=_CONTEXT_SEPARATOR.join(context_chunks)
+        )
 
         return [
-            {"role": "system", "content": PromptTemplates.SYSTEM_MEDICAL_ASSISTANT},
+            PromptTemplates._MEDICAL_ASSISTANT_MESSAGE,
             {"role": "user", "content": user_message}
         ]
 
@@ -219,29 +315,14 @@ class PromptTemplates:
         Returns:
             Formatted messages
         """
-        user_message = f"""ВОПРОС:
-{question}
-
-ОТВЕТ СТУДЕНТА:
-{student_answer}
-
-ПРАВИЛЬНЫЙ ОТВЕТ:
-{correct_answer}
-
-ЗАДАЧА:
-Оцени ответ студента и дай обратную связь.
-
-Структура:
-1. **Оценка** (правильно/частично правильно/неправильно)
-2. **Что верно** в ответе студента
-3. **Что упущено или неверно**
-4. **Объяснение** правильного ответа
-5. **Советы** для лучшего запоминания
-
-Будь конструктивным и поддерживающим."""
+        user_message = _CHECK_ANSWER_TEMPLATE.substitute(
+            question=question,
+            student_answer=student_answer,
+            correct_answer=correct_answer
+        )
 
         return [
-            {"role": "system", "content": PromptTemplates.SYSTEM_EXAM_TUTOR},
+            PromptTemplates._EXAM_TUTOR_MESSAGE,
             {"role": "user", "content": user_message}
         ]
 
@@ -256,30 +337,16 @@ class PromptTemplates:
         Returns:
             Formatted messages
         """
-        user_message = f"""КЛИНИЧЕСКИЙ СЛУЧАЙ:
-
-Пациент: {case_data.get('name', 'Не указано')}, {case_data.get('age')} лет
-
-Жалобы:
-{chr(10).join(f"- {c}" for c in case_data.get('complaints', []))}
-
-Анамнез:
-{case_data.get('history', 'Не указано')}
-
-Объективно:
-{case_data.get('physical_exam', 'Не указано')}
-
-ЗАДАЧА:
-Составь краткое медицинское резюме этого случая для учебных целей.
-
-Структура:
-1. **Краткое описание** (2-3 предложения)
-2. **Ключевые находки**
-3. **Предполагаемый диагноз**
-4. **Учебные моменты** (что важно запомнить)"""
+        user_message = _SUMMARIZE_CASE_TEMPLATE.substitute(
+            name=case_data.get('name', 'Не указано'),
+            age=case_data.get('age'),
+            complaints=_bullet_list(case_data.get('complaints', [])),
+            history=case_data.get('history', 'Не указано'),
+            physical_exam=case_data.get('physical_exam', 'Не указано')
+        )
 
         return [
-            {"role": "system", "content": PromptTemplates.SYSTEM_MEDICAL_ASSISTANT},
+            PromptTemplates._MEDICAL_ASSISTANT_MESSAGE,
             {"role": "user", "content": user_message}
         ]
 
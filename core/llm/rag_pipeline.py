@@ -4,7 +4,9 @@ Combines vector search with LLM generation for accurate, grounded answers.
 """
 
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 from .llm_manager import LLMManager
 from .prompt_templates import PromptTemplates
 
@@ -42,55 +44,99 @@ class RAGPipeline:
         self.vector_store = vector_store
         self.top_k = top_k
         self.min_score = min_score
+        self._cached_search = lru_cache(maxsize=256)(self._do_search)
+        self._cached_search_batch = lru_cache(maxsize=128)(self._do_search_batch)
+        # Single worker that prefills the static prompt prefix during retrieval
+        self._prefill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-prefill")
 
-    def answer_question(
+    def _store_generation(self) -> Tuple[int, Optional[int]]:
+        """
+        Cache key part that changes whenever the vector store changes.
+
+        Other writers (the modes, direct add_texts calls) share the store,
+        so memoized results are keyed on its generation counter instead of
+        relying on clear_search_cache being called.
+        """
+        return id(self.vector_store), getattr(self.vector_store, "generation", None)
+
+    def _do_search(
+        self,
+        query: str,
+        k: int,
+        min_score: Optional[float] = None,
+        generation: Optional[Tuple] = None
+    ) -> Tuple[Tuple[str, Dict, float], ...]:
+        """Run a vector search; results are memoized by _cached_search."""
+        return tuple(self.vector_store.similarity_search(query=query, k=k, min_score=min_score))
+
+    def _do_search_batch(
+        self,
+        queries: Tuple[str, ...],
+        k: int,
+        min_score: Optional[float] = None,
+        generation: Optional[Tuple] = None
+    ) -> Tuple[Tuple[Tuple[str, Dict, float], ...], ...]:
+        """Run one batched vector search; memoized by _cached_search_batch."""
+        return tuple(
+            tuple(results)
+            for results in self.vector_store.similarity_search_batch(
+                list(queries), k=k, min_score=min_score
+            )
+        )
+
+    def clear_search_cache(self):
+        """Drop memoized retrieval results (call after the index changes)."""
+        self._cached_search.cache_clear()
+        self._cached_search_batch.cache_clear()
+
+    def _prepare_question(
         self,
         question: str,
-        use_context: bool = True,
-        max_tokens: int = 512,
-        temperature: float = 0.7
-    ) -> Dict:
+        use_context: bool,
+        query_embedding: Optional[Any] = None
+    ) -> Tuple[List[Dict[str, str]], List[Dict], bool]:
         """
-        Answer medical question using RAG.
+        Retrieve context for a question and build its chat messages.
 
         Args:
             question: Student's question
-            use_context: Whether to use retrieved context (if False, just LLM)
-            max_tokens: Max tokens to generate
-            temperature: Sampling temperature
+            use_context: Whether to retrieve context
+            query_embedding: The question's embedding, if the caller already
+                computed it (searched directly, without memoization)
 
         Returns:
-            Dictionary with answer, sources, and metadata
+            Tuple of (messages, sources, used_context)
         """
-        if not self.llm.is_available():
-            return {
-                "status": "error",
-                "error": "LLM not loaded",
-                "answer": "",
-                "sources": []
-            }
-
-        # Step 1: Retrieve context
+        # Retrieve context
         context_chunks = []
         sources = []
 
         if use_context and self.vector_store:
+            # Prefill system prompt + static question header while searching
+            prefill = self._prefill_executor.submit(
+                self.llm.prefill, PromptTemplates.question_answering_prefix()
+            )
+
             try:
                 # Search vector store
-                results = self.vector_store.similarity_search(
-                    query=question,
-                    k=self.top_k
-                )
+                # Low-score chunks are filtered inside the store
+                if query_embedding is not None:
+                    results = self.vector_store.similarity_search(
+                        query=question, k=self.top_k, min_score=self.min_score,
+                        query_embedding=query_embedding
+                    )
+                else:
+                    results = self._cached_search(
+                        question, self.top_k, self.min_score, self._store_generation()
+                    )
 
-                # Filter by score
                 for text, metadata, score in results:
-                    if score >= self.min_score:
-                        context_chunks.append(text)
-                        sources.append({
-                            "text": text[:200] + "..." if len(text) > 200 else text,
-                            "metadata": metadata,
-                            "score": float(score)
-                        })
+                    context_chunks.append(text)
+                    sources.append({
+                        "text": text[:200] + "..." if len(text) > 200 else text,
+                        "metadata": metadata,
+                        "score": float(score)
+                    })
 
                 logger.info(f"Retrieved {len(context_chunks)} relevant chunks")
 
@@ -98,7 +144,10 @@ class RAGPipeline:
                 logger.error(f"Retrieval error: {str(e)}")
                 # Continue without context
 
-        # Step 2: Create prompt
+            # The model must be idle before generation starts
+            prefill.result()
+
+        # Create prompt
         if context_chunks:
             messages = PromptTemplates.question_answering(question, context_chunks)
         else:
@@ -108,6 +157,41 @@ class RAGPipeline:
                 {"role": "user", "content": f"Ответь на вопрос студента-медика: {question}"}
             ]
 
+        return messages, sources, len(context_chunks) > 0
+
+    def answer_question(
+        self,
+        question: str,
+        use_context: bool = True,
+        max_tokens: int = 512,
+        temperature: float = 0.7,
+        query_embedding: Optional[Any] = None
+    ) -> Dict:
+        """
+        Answer medical question using RAG.
+
+        Args:
+            question: Student's question
+            use_context: Whether to use retrieved context (if False, just LLM)
+            max_tokens: Max tokens to generate
+            temperature: Sampling temperature
+            query_embedding: The question's embedding from the vector store's
+                model, if already computed (saves encoding it again)
+
+        Returns:
+            Dictionary with answer, sources, and metadata
+        """
+        if not self.llm.is_available():
+            return {
+                "status": "error",
+                "error": "LLM not loaded",
+                "answer": "",
+                "sources": []
+            }
+
+        # Step 1-2: Retrieve context and create prompt
+        messages, sources, used_context = self._prepare_question(question, use_context, query_embedding)
+
         # Step 3: Generate answer
         response = self.llm.chat(
             messages=messages,
@@ -124,7 +208,7 @@ class RAGPipeline:
                     "tokens": response["tokens"],
                     "time_seconds": response["time_seconds"],
                     "tokens_per_second": response["tokens_per_second"],
-                    "used_context": len(context_chunks) > 0
+                    "used_context": used_context
                 }
             }
         else:
@@ -135,6 +219,61 @@ class RAGPipeline:
                 "sources": []
             }
 
+    def answer_question_stream(
+        self,
+        question: str,
+        use_context: bool = True,
+        max_tokens: int = 512,
+        temperature: float = 0.7
+    ) -> Iterator[Dict]:
+        """
+        Answer medical question using RAG, yielding the answer as it is generated.
+
+        Events, in order:
+            {"event": "sources", "sources": [...]} - once, before generation
+            {"event": "token", "text": "..."} - per generated text chunk
+            {"event": "done", "answer": "...", "metadata": {...}} - at the end
+        On failure a single {"event": "error", "error": "..."} is yielded.
+
+        Args:
+            question: Student's question
+            use_context: Whether to use retrieved context (if False, just LLM)
+            max_tokens: Max tokens to generate
+            temperature: Sampling temperature
+
+        Yields:
+            Event dictionaries
+        """
+        if not self.llm.is_available():
+            yield {"event": "error", "error": "LLM not loaded"}
+            return
+
+        messages, sources, used_context = self._prepare_question(question, use_context)
+        yield {"event": "sources", "sources": sources}
+
+        parts = []
+        try:
+            for text in self.llm.chat_stream(
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ):
+                parts.append(text)
+                yield {"event": "token", "text": text}
+        except Exception as e:
+            logger.error(f"Streaming generation error: {str(e)}")
+            yield {"event": "error", "error": str(e)}
+            return
+
+        yield {
+            "event": "done",
+            "answer": "".join(parts).strip(),
+            "metadata": {
+                "tokens": len(parts),
+                "used_context": used_context
+            }
+        }
+
     def explain_term(self, term: str) -> Dict:
         """
         Explain medical term using RAG.
@@ -152,7 +291,7 @@ class RAGPipeline:
         context = ""
         if self.vector_store:
             try:
-                results = self.vector_store.similarity_search(query=term, k=1)
+                results = self._cached_search(term, 1, None, self._store_generation())
                 if results:
                     context = results[0][0]  # First chunk text
             except Exception as e:
@@ -191,15 +330,26 @@ class RAGPipeline:
         context_chunks = []
         if self.vector_store:
             try:
-                # Search for each symptom
-                for symptom in symptoms[:3]:  # Limit to avoid too many searches
-                    results = self.vector_store.similarity_search(query=symptom, k=2)
-                    for text, _, score in results:
-                        if score >= self.min_score:
-                            context_chunks.append(text)
-
-                # Remove duplicates
-                context_chunks = list(set(context_chunks))[:5]  # Max 5 chunks
+                # Search all symptoms in one batched query
+                batch_results = self._cached_search_batch(  # Limit to avoid too many searches
+                    tuple(symptoms[:3]), 2, self.min_score, self._store_generation()
+                )
+                candidates = [
+                    (score, text)
+                    for results in batch_results
+                    for text, _, score in results
+                ]
+
+                # Remove duplicates, best scores first. Chunk texts are the
+                # store's own str objects, so their hashes are already cached
+                candidates.sort(key=lambda item: item[0], reverse=True)
+                seen = set()
+                for _, text in candidates:
+                    if text not in seen:
+                        seen.add(text)
+                        context_chunks.append(text)
+                        if len(context_chunks) == 5:  # Max 5 chunks
+                            break
 
             except Exception as e:
                 logger.error(f"Context retrieval error: {str(e)}")
@@ -307,6 +457,7 @@ class RAGPipeline:
     def set_vector_store(self, vector_store):
         """Update vector store reference."""
         self.vector_store = vector_store
+        self.clear_search_cache()
         logger.info("Vector store updated in RAG pipeline")
 
     def __repr__(self):
@@ -1,6 +1,6 @@
 """Modes initialization."""
 
-from .base_mode import BaseMode
+from .base_mode import BaseMode, SearchHit
 from .local_mode import LocalMode
 from .cloud_mode import CloudMode
 from .hybrid_mode import HybridMode
@@ -9,4 +9,4 @@ from .hybrid_mode import HybridMode
 PrivateMode = LocalMode
 PublicMode = CloudMode
 
-__all__ = ['BaseMode', 'LocalMode', 'CloudMode', 'HybridMode', 'PrivateMode', 'PublicMode']
\ No newline at end of file
+__all__ = ['BaseMode', 'SearchHit', 'LocalMode', 'CloudMode', 'HybridMode', 'PrivateMode', 'PublicMode']
\ No newline at end of file
@@ -3,19 +3,107 @@ Base mode module for DocMentor.
 Handles interaction between PDF converter and vector store.
 """
 
+import atexit
 import logging
+import threading
+import weakref
+from dataclasses import dataclass, fields
+from functools import cache
 from pathlib import Path
-from typing import List, Dict, Optional, Union
-from abc import ABC, abstractmethod
+from typing import Any, List, Dict, Optional, Tuple, Union
+from abc import ABC
 import os
 
 from ..vector_store import FAISSStore
+from ..utils.file_utils import fast_copy, file_digest
 
 logger = logging.getLogger(__name__)
 
+# Guards creation of the shared PDF processors
+_PROCESSOR_LOCK = threading.Lock()
+
+# Modes with coalesced, not yet saved changes; held weakly so pending
+# saves do not keep mode instances alive
+_DIRTY_MODES: "weakref.WeakSet[BaseMode]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_dirty_modes():
+    """Save every mode that still has unsaved changes at interpreter exit."""
+    for mode in list(_DIRTY_MODES):
+        try:
+            mode.flush()
+        except Exception as e:
+            logger.error(f"Error saving {mode.MODE_NAME or 'mode'} vector store at exit: {str(e)}")
+
+
+@cache
+def _create_processor(cache_dir: str):
+    """Build the processor for cache_dir; memoized per directory."""
+    # PDF processing needs PyMuPDF; search works without it
+    try:
+        from ..converter.enhanced_processor import EnhancedProcessor
+    except ImportError as e:
+        raise ImportError("PyMuPDF is required to process documents") from e
+    return EnhancedProcessor(cache_dir=cache_dir)
+
+
+def _get_processor(cache_dir: str):
+    """PDF processor shared by every mode instance using cache_dir."""
+    # Serialize first construction so concurrent callers get one instance
+    with _PROCESSOR_LOCK:
+        return _create_processor(cache_dir)
+
+@dataclass(slots=True, frozen=True)
+class SearchHit:
+    """
+    One search result.
+    
+    Fields are plain attributes (hit.text); item access (hit["text"],
+    hit.get("text"), "text" in hit) is kept for callers written against
+    the old dict results.
+    """
+    text: str
+    metadata: Dict
+    score: float
+    # Content hash of the chunk, as stored in the vector store
+    digest: bytes = b""
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+            
+    def __contains__(self, key: str) -> bool:
+        return key in _SEARCH_HIT_FIELDS
+        
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in _SEARCH_HIT_FIELDS else default
+        
+    def to_dict(self) -> Dict:
+        """Convert to the legacy {"text", "metadata", "score"} dict."""
+        return {"text": self.text, "metadata": self.metadata, "score": self.score}
+
+_SEARCH_HIT_FIELDS = frozenset(f.name for f in fields(SearchHit))
+
 class BaseMode(ABC):
     """Base class for DocMentor operation modes."""
     
+    # Number of ingested documents between vector store saves
+    SAVE_EVERY = 16
+    
+    # Each mode keeps its own index under vector_store/<MODE_NAME>, so
+    # searches need no per-query mode filter
+    MODE_NAME = ""
+    
+    # Ingested documents are kept under documents/<STORAGE_SUBDIR>
+    # (MODE_NAME if empty)
+    STORAGE_SUBDIR = ""
+    
+    # Extra metadata stamped on every document of this mode
+    DOCUMENT_METADATA: Dict[str, Any] = {}
+    
     def __init__(
         self,
         storage_path: Union[str, Path],
@@ -30,16 +118,36 @@ class BaseMode(ABC):
         """
         self.storage_path = Path(storage_path)
         self.model_name = model_name
+        
+        # Coalesced changes (see _mark_dirty) are written every SAVE_EVERY
+        # documents, on flush() and at interpreter exit
+        self._dirty = False
+        self._dirty_count = 0
         self.store = self._initialize_store()
         
+    @property
+    def _store_path(self) -> Path:
+        """Directory of this mode's vector store."""
+        store_path = self.storage_path / "vector_store"
+        return store_path / self.MODE_NAME if self.MODE_NAME else store_path
+        
     def _initialize_store(self) -> FAISSStore:
         """Initialize or load vector store."""
-        store_path = self.storage_path / "vector_store"
+        legacy_path = self.storage_path / "vector_store"
+        store_path = self._store_path
         
-        if store_path.exists():
+        if (store_path / "index.faiss").exists():
             logger.info(f"Loading existing vector store from {store_path}")
             return FAISSStore.load_local(str(store_path), self.model_name)
         
+        if self.MODE_NAME and (legacy_path / "index.faiss").exists():
+            # Split this mode's entries out of a store shared by all modes
+            logger.info(f"Migrating {self.MODE_NAME} entries from {legacy_path}")
+            store = FAISSStore.load_local(str(legacy_path), self.model_name)
+            store.retain(lambda meta: meta.get("mode") == self.MODE_NAME)
+            store.save_local(str(store_path))
+            return store
+        
         logger.info("Creating new vector store")
         store = FAISSStore(model_name=self.model_name)
         
@@ -49,18 +157,240 @@ class BaseMode(ABC):
         
         return store
         
-    @abstractmethod
+    @property
+    def _processor(self):
+        """PDF processor shared by all documents in this storage path."""
+        return _get_processor(str(self.storage_path / "cache"))
+        
     def process_document(self, file_path: Union[str, Path], metadata: Optional[Dict] = None) -> Dict:
-        """Process document and add to vector store."""
-        pass
+        """
+        Process document and add to vector store.
+        
+        Args:
+            file_path: Path to PDF document
+            metadata: Optional metadata for document
+            
+        Returns:
+            Dict with processing results
+        """
+        file_path = Path(file_path)
+        try:
+            digest = file_digest(file_path)
+            previous = self._find_ingested(digest)
+            if previous is not None:
+                logger.info(f"Document {file_path.name} already ingested, skipping")
+                return {"status": "success", **previous, "duplicate": True}
+                
+            chunks, metadata = self._extract_chunks(file_path, metadata, digest)
+            
+            # Add chunks to vector store; all chunks share one metadata dict.
+            # Chunks already stored (e.g. from another copy of the text)
+            # are skipped and not counted
+            added = self.store.add_texts(chunks, dict(metadata), skip_duplicates=True)
+            self._record_ingested(digest, {"chunks": len(added), "metadata": metadata})
+            self._mark_dirty()
+            
+            return {
+                "status": "success",
+                "chunks": len(added),
+                "metadata": metadata
+            }
+            
+        except Exception as e:
+            logger.error(f"Error processing document {file_path}: {str(e)}")
+            raise
+            
+    def process_document_batch(
+        self,
+        files: List[Union[str, Path]],
+        metadata: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Process several documents with a single index update and save.
         
-    @abstractmethod
-    def search(self, query: str, k: int = 4, filter_dict: Optional[Dict] = None) -> List[Dict]:
-        """Search for relevant document chunks."""
+        Args:
+            files: Paths to PDF documents
+            metadata: Optional metadata applied to every document
+            
+        Returns:
+            One result dict per file, in input order
+        """
+        results = []
+        all_chunks = []
+        all_metadata = []
+        # (digest, chunks, result) of each document going into the index
+        pending = []
+        # Result of the first copy of each document in this batch, and the
+        # (result, first result) pairs of later identical copies
+        seen: Dict[str, Dict] = {}
+        repeats = []
+        
+        for file_path in files:
+            file_path = Path(file_path)
+            try:
+                digest = file_digest(file_path)
+                if digest in seen:
+                    duplicate = {"status": "success", "duplicate": True}
+                    repeats.append((duplicate, seen[digest]))
+                    results.append(duplicate)
+                    continue
+                    
+                previous = self._find_ingested(digest)
+                if previous is not None:
+                    results.append({"status": "success", **previous, "duplicate": True})
+                    continue
+                    
+                chunks, doc_metadata = self._extract_chunks(
+                    file_path, dict(metadata) if metadata else None, digest
+                )
+            except Exception as e:
+                logger.error(f"Error processing document {file_path}: {str(e)}")
+                results.append({"status": "error", "error": str(e), "filename": file_path.name})
+                continue
+                
+            all_chunks.extend(chunks)
+            all_metadata.extend([dict(doc_metadata)] * len(chunks))
+            result = {"status": "success", "metadata": doc_metadata}
+            pending.append((digest, chunks, result))
+            seen[digest] = result
+            results.append(result)
+            
+        if all_chunks:
+            added = self.store.add_texts(all_chunks, all_metadata, skip_duplicates=True)
+            
+            # Each added text went in at its first occurrence in the batch
+            fresh = {self.store.texts[i] for i in added}
+            for digest, chunks, result in pending:
+                count = 0
+                for chunk in chunks:
+                    if chunk in fresh:
+                        fresh.discard(chunk)
+                        count += 1
+                result["chunks"] = count
+                self._record_ingested(digest, {"chunks": count, "metadata": result["metadata"]})
+            self.save()
+            
+        for duplicate, first in repeats:
+            duplicate.update(chunks=first["chunks"], metadata=first["metadata"])
+            
+        return results
+        
+    def _extract_chunks(
+        self,
+        file_path: Path,
+        metadata: Optional[Dict],
+        digest: Optional[str] = None
+    ) -> Tuple[List[str], Dict]:
+        """
+        Copy a document into this mode's storage and extract its text chunks.
+        
+        Args:
+            file_path: Path to PDF document
+            metadata: Optional metadata for document (updated in place)
+            digest: Content hash of the document, computed if omitted
+            
+        Returns:
+            Tuple of (chunks, metadata)
+        """
+        if metadata is None:
+            metadata = {}
+        if digest is None:
+            digest = file_digest(file_path)
+            
+        # Add mode information to metadata
+        metadata.update({
+            "mode": self.MODE_NAME,
+            "filename": file_path.name,
+            "content_hash": digest,
+        })
+        
+        doc_storage = self.storage_path / "documents" / (self.STORAGE_SUBDIR or self.MODE_NAME)
+        doc_storage.mkdir(parents=True, exist_ok=True)
+        target_path = self._store_document(file_path, doc_storage, digest)
+        
+        doc_data = self._processor.process_document_sync(target_path, use_cache=True)
+        
+        # Extract text chunks from processed pages
+        pages = doc_data.get("pages", ())
+        chunks = [text for page in pages if (text := page.get("text", "").strip())]
+        
+        if not chunks:
+            raise ValueError("No text content extracted from document")
+            
+        # Update metadata with document info
+        doc_info = doc_data.get("metadata", {})
+        metadata.update({
+            "title": doc_info.get("title", file_path.name),
+            "total_pages": len(pages),
+            "author": doc_info.get("author", ""),
+            **self.DOCUMENT_METADATA,
+        })
+        
+        return chunks, metadata
+        
+    def _store_document(self, file_path: Path, doc_storage: Path, digest: str) -> Path:
+        """
+        Place a copy of the document in doc_storage.
+        
+        Documents are stored under their content hash, so the same PDF
+        uploaded under another name is only copied once.
+        """
+        target_path = doc_storage / f"{digest}{file_path.suffix.lower()}"
+        if not target_path.exists():
+            fast_copy(file_path, target_path)
+        return target_path
+        
+    def _find_ingested(self, digest: str) -> Optional[Dict]:
+        """Previous processing result for a document hash, if tracked."""
+        return None
+        
+    def _record_ingested(self, digest: str, result: Dict):
+        """Remember the processing result for a document hash."""
         pass
         
+    def search(self, query: str, k: int = 4, filter_dict: Optional[Dict] = None) -> List[SearchHit]:
+        """
+        Search for relevant document chunks.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter_dict: Optional metadata filters
+            
+        Returns:
+            List of relevant chunks with metadata
+        """
+        # The store holds only this mode's documents, no mode filter needed
+        results = self.store.similarity_search(query, k=k, filter_dict=filter_dict, with_digests=True)
+        
+        return [
+            SearchHit(text, metadata, float(score), digest)
+            for text, metadata, score, digest in results
+        ]
+        
+    def _mark_dirty(self):
+        """
+        Record a document added without saving, saving once SAVE_EVERY have
+        piled up.
+        
+        Unsaved changes are also written by flush() and at interpreter exit.
+        """
+        self._dirty = True
+        self._dirty_count += 1
+        _DIRTY_MODES.add(self)
+        if self._dirty_count >= self.SAVE_EVERY:
+            self.save()
+            
+    def flush(self):
+        """Save the vector store if it has unsaved changes."""
+        if self._dirty:
+            self.save()
+        
     def save(self):
         """Save current state."""
-        store_path = self.storage_path / "vector_store"
+        store_path = self._store_path
         self.store.save_local(str(store_path))
+        self._dirty = False
+        self._dirty_count = 0
+        _DIRTY_MODES.discard(self)
         logger.info(f"Saved vector store to {store_path}")
\ No newline at end of file
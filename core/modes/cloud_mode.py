@@ -3,18 +3,24 @@ Cloud mode implementation for DocMentor.
 Handles cloud-based document processing and search with shared knowledge base.
 """
 
+import json
 import logging
+import os
 from pathlib import Path
 from typing import List, Dict, Optional, Union
-import shutil
 
 from .base_mode import BaseMode
+from ..utils.file_utils import link_or_copy
 
 logger = logging.getLogger(__name__)
 
 class CloudMode(BaseMode):
     """Cloud mode with shared document storage and processing."""
 
+    MODE_NAME = "cloud"
+    STORAGE_SUBDIR = "cloud"
+    DOCUMENT_METADATA = {"shared": True}  # Mark as shared in cloud
+
     def __init__(
         self,
         storage_path: Union[str, Path],
@@ -35,116 +41,49 @@ class CloudMode(BaseMode):
         self.cloud_endpoint = cloud_endpoint
         self.api_key = api_key
 
-    def process_document(self, file_path: Union[str, Path], metadata: Optional[Dict] = None) -> Dict:
-        """
-        Process document in cloud mode.
-
-        Args:
-            file_path: Path to PDF document
-            metadata: Optional metadata for document
-
-        Returns:
-            Dict with processing results
-        """
-        file_path = Path(file_path)
-        if metadata is None:
-            metadata = {}
-
-        # Add mode information to metadata
-        metadata.update({
-            "mode": "cloud",
-            "filename": file_path.name,
-        })
-
-        # Copy document to cloud storage cache
-        doc_storage = self.storage_path / "documents" / "cloud"
-        doc_storage.mkdir(parents=True, exist_ok=True)
+        # Content hashes of already ingested documents -> processing result
+        self._ingested_path = self.storage_path / "ingested.json"
+        self._ingested = self._load_ingested()
 
+    def _load_ingested(self) -> Dict[str, Dict]:
+        """Load the ingested-documents sidecar."""
+        if not self._ingested_path.exists():
+            return {}
+        try:
+            with open(self._ingested_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read {self._ingested_path}: {str(e)}")
+            return {}
+
+    def _find_ingested(self, digest: str) -> Optional[Dict]:
+        """Previous processing result for an identical PDF, if any."""
+        return self._ingested.get(digest)
+
+    def _record_ingested(self, digest: str, result: Dict):
+        """Remember a processed PDF so it is not ingested twice."""
+        self._ingested[digest] = result
+
+    def _store_document(self, file_path: Path, doc_storage: Path, digest: str) -> Path:
+        """Link document into cloud storage cache (copy across filesystems)."""
         target_path = doc_storage / file_path.name
         if not target_path.exists():
-            shutil.copy2(file_path, target_path)
-
-        # Use local PDF processor (cloud processing can be added later)
-        try:
-            from ..converter.enhanced_processor import EnhancedProcessor
-
-            processor = EnhancedProcessor(cache_dir=str(self.storage_path / "cache"))
-
-            # Process document synchronously
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            doc_data = loop.run_until_complete(
-                processor.process_document(target_path, use_cache=True)
-            )
-
-            # Extract text chunks from processed pages
-            chunks = []
-            for page_data in doc_data.get("pages", []):
-                text = page_data.get("text", "").strip()
-                if text:
-                    chunks.append(text)
-
-            if not chunks:
-                raise ValueError("No text content extracted from document")
-
-            # Update metadata with document info
-            metadata.update({
-                "title": doc_data.get("metadata", {}).get("title", file_path.name),
-                "total_pages": len(doc_data.get("pages", [])),
-                "author": doc_data.get("metadata", {}).get("author", ""),
-                "shared": True,  # Mark as shared in cloud
-            })
-
-            # Add chunks to vector store
-            chunk_metadata = [metadata.copy() for _ in chunks]
-            self.store.add_texts(chunks, chunk_metadata)
-            self.save()
-
-            return {
-                "status": "success",
-                "chunks": len(chunks),
-                "metadata": metadata
-            }
-
-        except Exception as e:
-            logger.error(f"Error processing document {file_path}: {str(e)}")
-            raise
+            link_or_copy(file_path, target_path)
+        return target_path
 
-    def search(self, query: str, k: int = 4, filter_dict: Optional[Dict] = None) -> List[Dict]:
+    def save(self):
         """
-        Search in cloud documents.
+        Save current state.
 
-        Args:
-            query: Search query
-            k: Number of results to return
-            filter_dict: Optional metadata filters
-
-        Returns:
-            List of relevant chunks with metadata
+        The ingested-documents sidecar is written after the index, so it
+        never lists documents the saved index does not contain.
         """
-        # Search in cloud documents
-        if filter_dict is None:
-            filter_dict = {}
-        filter_dict["mode"] = "cloud"
+        super().save()
 
-        # Perform search
-        results = self.store.similarity_search(query, k=k, filter_dict=filter_dict)
-
-        # Format results
-        formatted_results = []
-        for text, metadata, score in results:
-            formatted_results.append({
-                "text": text,
-                "metadata": metadata,
-                "score": score
-            })
-
-        return formatted_results
+        tmp_path = self._ingested_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._ingested, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self._ingested_path)
 
     def get_available_documents(self) -> List[Dict]:
         """
@@ -153,23 +92,28 @@ class CloudMode(BaseMode):
         Returns:
             List of document metadata
         """
-        doc_storage = self.storage_path / "documents" / "cloud"
-        if not doc_storage.exists():
-            return []
+        doc_storage = self.storage_path / "documents" / self.STORAGE_SUBDIR
 
+        # scandir entries carry file type and cache their stat result
         documents = []
-        for file_path in doc_storage.glob("*.pdf"):
-            try:
-                doc_info = {
-                    "filename": file_path.name,
-                    "size": file_path.stat().st_size,
-                    "mode": "cloud",
-                    "shared": True
-                }
-                documents.append(doc_info)
-            except Exception as e:
-                logger.error(f"Error getting info for {file_path}: {str(e)}")
-                continue
+        try:
+            with os.scandir(doc_storage) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".pdf"):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        documents.append({
+                            "filename": entry.name,
+                            "size": entry.stat().st_size,
+                            "mode": "cloud",
+                            "shared": True
+                        })
+                    except OSError as e:
+                        logger.error(f"Error getting info for {entry.path}: {str(e)}")
+        except FileNotFoundError:
+            return []
 
         return documents
 
@@ -1,27 +1,50 @@
 """Enhanced model with TREAD optimization"""
 
+import os
+from typing import List, Union
+
+import torch
 from transformers import AutoTokenizer, AutoModel
 from ..tread.optimization import TREADOptimizer
 
 class EnhancedModel:
-    def __init__(self, model_name: str = 'distilbert-base-uncased'):
-        """Initialize enhanced model with TREAD optimization"""
+    def __init__(self, model_name: str = 'distilbert-base-uncased', quantize: bool = False):
+        """Initialize enhanced model with TREAD optimization
+
+        With quantize=True the CPU model runs int8 dynamic quantization of
+        its linear layers; the FP32 model is kept otherwise.
+        """
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.model = AutoModel.from_pretrained(model_name)
+
+        # Inference only: no dropout, half precision on GPU, all cores on CPU
+        self.model.eval()
+        if torch.cuda.is_available():
+            self.device = torch.device("cuda")
+            self.model.to(self.device, dtype=torch.float16)
+        else:
+            self.device = torch.device("cpu")
+            torch.set_num_threads(os.cpu_count() or 1)
+            if quantize:
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+
         self.optimizer = TREADOptimizer(self.model)
 
-    def process_text(self, text: str):
-        """Process text using TREAD optimization"""
+    def process_text(self, text: Union[str, List[str]]):
+        """Process a text or a batch of texts using TREAD optimization"""
         inputs = self.tokenizer(
             text,
             return_tensors='pt',
             padding=True,
             truncation=True
-        )
+        ).to(self.device)
 
-        optimized_output = self.optimizer.optimize_forward_pass(
-            inputs['input_ids'],
-            attention_mask=inputs['attention_mask']
-        )
+        with torch.inference_mode():
+            optimized_output = self.optimizer.optimize_forward_pass(
+                inputs['input_ids'],
+                attention_mask=inputs['attention_mask']
+            )
 
-        return optimized_output
\ No newline at end of file
+        return optimized_output
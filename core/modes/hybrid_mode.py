@@ -5,20 +5,40 @@ Combines local and cloud functionalities for optimal performance.
 
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Union, Tuple
+from typing import Coroutine, List, Dict, Optional, Set, Union, Tuple
 import asyncio
 import time
 import os
-import json
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache, partial
+from itertools import chain, islice
 
-from .base_mode import BaseMode
+import aiohttp
+
+from .base_mode import BaseMode, SearchHit
 from .local_mode import LocalMode
 from .cloud_mode import CloudMode
 from ..utils.sync_manager import SyncManager
 from ..utils.cache_manager import CacheManager
+from ..utils import json_utils
+from ..vector_store.faiss_store import chunk_digest
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4096)
+def _build_cache_key(query: str, k: int, filter_items, generation: str = "") -> str:
+    """SHA-256 search cache key; filter_items is order-independent."""
+    key_parts = [query, str(k)]
+    if generation:
+        key_parts.append(f"gen:{generation}")
+    
+    # Sort filter items for deterministic ordering
+    for key, value in sorted(filter_items):
+        key_parts.append(f"{key}:{value}")
+        
+    return hashlib.sha256(":".join(key_parts).encode()).hexdigest()
+
 class HybridMode(BaseMode):
     """
     Hybrid mode combining local and cloud capabilities.
@@ -27,6 +47,30 @@ class HybridMode(BaseMode):
     based on availability, network conditions, and query complexity.
     """
     
+    MODE_NAME = "hybrid"
+    
+    # Background polling (seconds); intervals back off up to the caps
+    # while the cloud is unreachable or syncs have nothing to do
+    CONNECTION_CHECK_INTERVAL = 60
+    MAX_CONNECTION_CHECK_INTERVAL = 600
+    SYNC_CHECK_INTERVAL = 300
+    MAX_SYNC_CHECK_INTERVAL = 3600
+    MAX_IDLE_SYNC_FACTOR = 4
+    
+    # Async ingest pipeline: bounded queue depth and extraction workers
+    INGEST_QUEUE_SIZE = 8
+    INGEST_WORKERS = 2
+    
+    # In-process search result cache in front of the on-disk CacheManager
+    L1_CACHE_SIZE = 1024
+    L1_CACHE_TTL = 300
+    
+    # Background flushing: config changes are written CONFIG_FLUSH_DELAY
+    # seconds after the last change (minor), unsaved store changes every
+    # STORE_FLUSH_INTERVAL seconds (major)
+    CONFIG_FLUSH_DELAY = 2
+    STORE_FLUSH_INTERVAL = 60
+    
     def __init__(
         self,
         local_storage_path: Union[str, Path],
@@ -36,6 +80,7 @@ class HybridMode(BaseMode):
         model_name: str = "Qwen2.5-MED-3B",
         offline_mode: bool = False,
         prefer_local: bool = True,
+        http_session: Optional[aiohttp.ClientSession] = None,
     ):
         """
         Initialize hybrid mode.
@@ -48,6 +93,8 @@ class HybridMode(BaseMode):
             model_name: Name of the model to use
             offline_mode: Whether to start in offline mode
             prefer_local: Whether to prefer local processing over cloud
+            http_session: Optional aiohttp session for all sync requests;
+                the caller keeps ownership and closes it
         """
         super().__init__(local_storage_path, model_name)
         
@@ -65,11 +112,16 @@ class HybridMode(BaseMode):
             local_path=local_storage_path,
             cloud_endpoint=cloud_endpoint,
             api_key=api_key,
-            sync_interval=sync_interval
+            sync_interval=sync_interval,
+            session=http_session
         )
         
         # Cache manager for local caching
         self.cache_manager = CacheManager(str(local_storage_path / "cache"))
+        # (cache_key, last_sync_time) -> (expiry, results), in LRU order
+        self._l1_cache: OrderedDict = OrderedDict()
+        # Bumped on every ingest; part of every search cache key
+        self._cache_gen = 0
         
         # Configuration
         self.offline_mode = offline_mode
@@ -81,18 +133,98 @@ class HybridMode(BaseMode):
         self.cloud_available = not offline_mode
         self.connection_check_task = None
         
+        # Set to wake the background loops before their timeout
+        self._monitor_wake = asyncio.Event()
+        self._sync_wake = asyncio.Event()
+        # Grows while periodic syncs find nothing to transfer
+        self._effective_sync_interval = sync_interval
+        
+        # Config changes waiting for the flush task; the lock keeps store
+        # saves from overlapping pipeline upserts
+        self._config_dirty = False
+        self._flush_wake = asyncio.Event()
+        self._store_lock = asyncio.Lock()
+        
+        # Ingest pipeline (started on first aprocess_document call)
+        self._extract_queue: Optional[asyncio.Queue] = None
+        self._upsert_queue: Optional[asyncio.Queue] = None
+        self._ingest_workers: List[asyncio.Task] = []
+        
+        # Every other task this instance spawns; cancelled by aclose()
+        self._bg_tasks: Set[asyncio.Task] = set()
+        
         # Start background tasks if not in offline mode
         if not offline_mode:
             self._start_background_tasks()
     
     def _start_background_tasks(self):
         """Start background tasks for synchronization and monitoring."""
+        # Already running (e.g. started again after leaving offline mode)
+        if self.connection_check_task is not None and not self.connection_check_task.done():
+            return
+            
         loop = asyncio.get_event_loop()
-        self.connection_check_task = loop.create_task(self._monitor_cloud_connection())
-        loop.create_task(self._periodic_sync())
+        self.connection_check_task = self._spawn(self._monitor_cloud_connection(), loop)
+        self._spawn(self._periodic_sync(), loop)
+        self._spawn(self._flush_worker(), loop)
+    
+    def _spawn(
+        self,
+        coro: Coroutine,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> asyncio.Task:
+        """Create a task that is kept referenced until it finishes."""
+        task = (loop or asyncio.get_event_loop()).create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+    
+    def _wake_background_tasks(self):
+        """Make the monitor and sync loops run their next check now."""
+        self._monitor_wake.set()
+        self._sync_wake.set()
+    
+    @staticmethod
+    async def _wait(event: asyncio.Event, timeout: float) -> bool:
+        """Sleep up to timeout seconds, returning True early if event is set."""
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        woken = event.is_set()
+        event.clear()
+        return woken
+    
+    def _schedule_config_save(self):
+        """Mark the config as changed; the flush task writes it shortly."""
+        self._config_dirty = True
+        self._flush_wake.set()
+    
+    async def _flush_worker(self):
+        """Write config changes (debounced) and unsaved stores (periodically)."""
+        next_store_flush = time.monotonic() + self.STORE_FLUSH_INTERVAL
+        while True:
+            timeout = max(next_store_flush - time.monotonic(), 0)
+            if await self._wait(self._flush_wake, timeout):
+                # Let a burst of changes settle into one write
+                await asyncio.sleep(self.CONFIG_FLUSH_DELAY)
+                self._flush_wake.clear()
+                
+            try:
+                if self._config_dirty:
+                    self._save_config()
+                    
+                if time.monotonic() >= next_store_flush:
+                    async with self._store_lock:
+                        self.local_mode.flush()
+                        self.cloud_mode.flush()
+                    next_store_flush = time.monotonic() + self.STORE_FLUSH_INTERVAL
+            except Exception as e:
+                logger.error(f"Error flushing hybrid mode state: {str(e)}")
     
     async def _monitor_cloud_connection(self):
         """Continuously monitor cloud connection status."""
+        interval = self.CONNECTION_CHECK_INTERVAL
         while True:
             try:
                 status = await self.cloud_mode.check_connection()
@@ -104,6 +236,8 @@ class HybridMode(BaseMode):
                     # Trigger sync after reconnection
                     await self.sync_manager.sync()
                     self.last_sync_time = time.time()
+                    self._l1_cache.clear()
+                    self._schedule_config_save()
                     
                 elif not status and not self.offline_mode:
                     logger.warning("Cloud connection lost, entering offline mode")
@@ -114,23 +248,46 @@ class HybridMode(BaseMode):
                 self.cloud_available = False
                 self.offline_mode = True
                 
-            await asyncio.sleep(60)  # Check every minute
+            # Back off while the cloud is unreachable
+            if self.cloud_available:
+                interval = self.CONNECTION_CHECK_INTERVAL
+            else:
+                interval = min(interval * 2, self.MAX_CONNECTION_CHECK_INTERVAL)
+                
+            await self._wait(self._monitor_wake, interval)
     
     async def _periodic_sync(self):
         """Periodically synchronize with cloud server."""
+        interval = self.SYNC_CHECK_INTERVAL
         while True:
             if self.cloud_available and not self.offline_mode:
                 current_time = time.time()
-                if current_time - self.last_sync_time >= self.sync_interval:
+                if current_time - self.last_sync_time >= self._effective_sync_interval:
                     try:
                         logger.info("Starting periodic sync with cloud")
-                        await self.sync_manager.sync()
+                        result = await self.sync_manager.sync()
+                        if result.get("status") == "error":
+                            raise RuntimeError(result.get("message", "sync failed"))
+                            
                         self.last_sync_time = current_time
+                        self._l1_cache.clear()
+                        self._schedule_config_save()
+                        interval = self.SYNC_CHECK_INTERVAL
+                        
+                        # Sync less often while there is nothing to transfer
+                        if any(result.get(key) for key in ("uploaded", "downloaded", "conflicts")):
+                            self._effective_sync_interval = self.sync_interval
+                        else:
+                            self._effective_sync_interval = min(
+                                self._effective_sync_interval * 2,
+                                self.sync_interval * self.MAX_IDLE_SYNC_FACTOR
+                            )
                         logger.info("Periodic sync completed successfully")
                     except Exception as e:
                         logger.error(f"Error during periodic sync: {str(e)}")
+                        interval = min(interval * 2, self.MAX_SYNC_CHECK_INTERVAL)
             
-            await asyncio.sleep(300)  # Check every 5 minutes
+            await self._wait(self._sync_wake, interval)
     
     def process_document(self, file_path: Union[str, Path], metadata: Optional[Dict] = None) -> Dict:
         """
@@ -160,11 +317,12 @@ class HybridMode(BaseMode):
         # Process document locally
         try:
             result = self.local_mode.process_document(file_path, metadata)
+            self._invalidate_search_cache()
             logger.info(f"Document {file_path.name} processed locally")
             
             # Schedule cloud sync if available
             if self.cloud_available and not self.offline_mode:
-                asyncio.create_task(self._sync_document(file_path, metadata))
+                self._spawn(self._sync_document(file_path, metadata))
                 
             return result
             
@@ -176,13 +334,122 @@ class HybridMode(BaseMode):
                 try:
                     logger.info(f"Attempting to process document {file_path.name} in cloud")
                     metadata["processed_at_local"] = False
-                    return self.cloud_mode.process_document(file_path, metadata)
+                    result = self.cloud_mode.process_document(file_path, metadata)
+                    self._invalidate_search_cache()
+                    return result
                 except Exception as cloud_e:
                     logger.error(f"Error processing document in cloud: {str(cloud_e)}")
                     
             # Re-raise original exception if both methods fail
             raise
     
+    async def aprocess_document(
+        self,
+        file_path: Union[str, Path],
+        metadata: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Process document locally through the async ingest pipeline.
+        
+        Documents flow extract -> upsert through bounded queues: PDF parsing
+        runs on INGEST_WORKERS executor threads, while a single upsert
+        worker embeds chunks and writes them to the local store. A full
+        queue makes callers wait (backpressure) instead of piling up work.
+        
+        Args:
+            file_path: Path to PDF document
+            metadata: Optional metadata for document
+            
+        Returns:
+            Dict with processing results
+        """
+        file_path = Path(file_path)
+        metadata = dict(metadata or {})
+        metadata.update({
+            "mode": "hybrid",
+            "filename": file_path.name,
+            "processed_at_local": True
+        })
+        
+        self._start_ingest_pipeline()
+        future = asyncio.get_running_loop().create_future()
+        await self._extract_queue.put((file_path, metadata, future))
+        result = await future
+        
+        # Schedule cloud sync if available
+        if self.cloud_available and not self.offline_mode:
+            self._spawn(self._sync_document(file_path, metadata))
+            
+        return result
+    
+    def _start_ingest_pipeline(self):
+        """Create the ingest queues and workers on the running loop."""
+        if self._ingest_workers:
+            return
+            
+        self._extract_queue = asyncio.Queue(maxsize=self.INGEST_QUEUE_SIZE)
+        self._upsert_queue = asyncio.Queue(maxsize=self.INGEST_QUEUE_SIZE)
+        self._ingest_workers = [
+            asyncio.create_task(self._extract_worker())
+            for _ in range(self.INGEST_WORKERS)
+        ]
+        self._ingest_workers.append(asyncio.create_task(self._upsert_worker()))
+    
+    async def _extract_worker(self):
+        """Parse queued documents into text chunks off the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            file_path, metadata, future = await self._extract_queue.get()
+            try:
+                chunks, metadata = await loop.run_in_executor(
+                    None, self.local_mode._extract_chunks, file_path, metadata
+                )
+                await self._upsert_queue.put((chunks, metadata, future))
+            except asyncio.CancelledError:
+                self._fail_ingest(future)
+                raise
+            except Exception as e:
+                logger.error(f"Error processing document {file_path}: {str(e)}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._extract_queue.task_done()
+    
+    async def _upsert_worker(self):
+        """Embed extracted chunks and add them to the local store, one document at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            chunks, metadata, future = await self._upsert_queue.get()
+            try:
+                async with self._store_lock:
+                    added = await loop.run_in_executor(
+                        None,
+                        partial(self.local_mode.store.add_texts, chunks, dict(metadata), skip_duplicates=True)
+                    )
+                self.local_mode._mark_dirty()
+                self._invalidate_search_cache()
+                if not future.done():
+                    future.set_result({
+                        "status": "success",
+                        "chunks": len(added),
+                        "metadata": metadata
+                    })
+            except asyncio.CancelledError:
+                self._fail_ingest(future)
+                raise
+            except Exception as e:
+                logger.error(f"Error adding document {metadata.get('filename')}: {str(e)}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._upsert_queue.task_done()
+    
+    @staticmethod
+    def _fail_ingest(future: asyncio.Future):
+        """Resolve a document's ingest future once the pipeline has shut down."""
+        if not future.done():
+            future.set_exception(RuntimeError("Ingest pipeline closed"))
+    
     async def _sync_document(self, file_path: Path, metadata: Dict):
         """
         Synchronize processed document with cloud.
@@ -197,7 +464,7 @@ class HybridMode(BaseMode):
         except Exception as e:
             logger.error(f"Error synchronizing document {file_path.name}: {str(e)}")
     
-    def search(self, query: str, k: int = 4, filter_dict: Optional[Dict] = None) -> List[Dict]:
+    def search(self, query: str, k: int = 4, filter_dict: Optional[Dict] = None) -> List[SearchHit]:
         """
         Search in hybrid mode.
         
@@ -217,10 +484,8 @@ class HybridMode(BaseMode):
             
         # Check cache first
         cache_key = self._generate_cache_key(query, k, filter_dict)
-        cached_results = self.cache_manager.get(cache_key, "search_results")
-        
-        if cached_results:
-            logger.info(f"Search results found in cache for query: {query}")
+        cached_results = self._get_cached_search(cache_key, query)
+        if cached_results is not None:
             return cached_results
         
         # Determine whether to use local or cloud search
@@ -234,18 +499,7 @@ class HybridMode(BaseMode):
                 # If results are insufficient and cloud is available, supplement with cloud results
                 if len(results) < k and self.cloud_available and not self.offline_mode:
                     cloud_results = self.cloud_mode.search(query, k - len(results), filter_dict)
-                    results.extend(cloud_results)
-                    
-                    # Deduplicate results
-                    seen_texts = set()
-                    unique_results = []
-                    for result in results:
-                        text_hash = hash(result.get("text", ""))
-                        if text_hash not in seen_texts:
-                            seen_texts.add(text_hash)
-                            unique_results.append(result)
-                    
-                    results = unique_results[:k]
+                    results = self._merge_results(k, results, cloud_results)
             else:
                 # Try cloud search first if preferred and available
                 if self.cloud_available and not self.offline_mode:
@@ -268,23 +522,141 @@ class HybridMode(BaseMode):
                 logger.info("Falling back to local search")
                 results = self.local_mode.search(query, k, filter_dict)
         
-        # Cache successful results
-        if results:
-            self.cache_manager.put(cache_key, results, "search_results")
+        self._cache_search(cache_key, results)
+        return results
+    
+    async def asearch(self, query: str, k: int = 4, filter_dict: Optional[Dict] = None) -> List[SearchHit]:
+        """
+        Search local and cloud stores concurrently.
+        
+        Unlike search(), which only asks the cloud after local search comes
+        up short, both searches run at once on executor threads, so latency
+        is the slower of the two rather than their sum. Results of the
+        preferred side come first; the other side fills up to k. If one
+        side fails, the other side's results are used.
         
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter_dict: Optional metadata filters
+            
+        Returns:
+            List of relevant chunks with metadata
+        """
+        if filter_dict is None:
+            filter_dict = {}
+            
+        cache_key = self._generate_cache_key(query, k, filter_dict)
+        cached_results = self._get_cached_search(cache_key, query)
+        if cached_results is not None:
+            return cached_results
+            
+        loop = asyncio.get_running_loop()
+        
+        if not self.cloud_available or self.offline_mode:
+            results = await loop.run_in_executor(
+                None, self.local_mode.search, query, k, filter_dict
+            )
+        else:
+            local_results, cloud_results = await asyncio.gather(
+                loop.run_in_executor(None, self.local_mode.search, query, k, filter_dict),
+                loop.run_in_executor(None, self.cloud_mode.search, query, k, filter_dict),
+                return_exceptions=True
+            )
+            
+            ordered = [local_results, cloud_results]
+            if not self.prefer_local:
+                ordered.reverse()
+                
+            succeeded = []
+            for outcome in ordered:
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error in hybrid search: {str(outcome)}")
+                else:
+                    succeeded.append(outcome)
+                    
+            if not succeeded:
+                raise ordered[0]
+                
+            results = self._merge_results(k, *succeeded)
+            
+        self._cache_search(cache_key, results)
         return results
     
+    @staticmethod
+    def _merge_results(k: int, *result_lists: List[SearchHit]) -> List[SearchHit]:
+        """Concatenate result lists, dropping duplicate chunks, up to k hits."""
+        # Keyed by the content hash the stores dedup on at ingest, carried
+        # on each hit; first occurrence wins
+        unique_results = {}
+        for result in chain(*result_lists):
+            digest = result.get("digest") or chunk_digest(result.get("text", ""))
+            unique_results.setdefault(digest, result)
+            
+        return list(islice(unique_results.values(), k))
+    
+    def _get_cached_search(self, cache_key: str, query: str) -> Optional[List[SearchHit]]:
+        """Look up search results in the in-process cache, then the on-disk cache."""
+        l1_key = (cache_key, self.last_sync_time)
+        cached_results = self._l1_get(l1_key)
+        if cached_results is not None:
+            return cached_results
+            
+        cached_results = self.cache_manager.get(cache_key, "search_results")
+        
+        if cached_results:
+            logger.info(f"Search results found in cache for query: {query}")
+            self._l1_put(l1_key, cached_results)
+            return cached_results
+            
+        return None
+    
+    def _cache_search(self, cache_key: str, results: List[SearchHit]):
+        """Cache successful search results in both cache tiers."""
+        if results:
+            # Lease: disk entries expire after one sync interval at most
+            self.cache_manager.put(cache_key, results, "search_results", ttl=self.sync_interval)
+            self._l1_put((cache_key, self.last_sync_time), results)
+    
+    def _l1_get(self, key: Tuple[str, float]) -> Optional[List[SearchHit]]:
+        """Look up search results in the in-process cache."""
+        entry = self._l1_cache.get(key)
+        if entry is None:
+            return None
+            
+        expires, results = entry
+        if time.monotonic() > expires:
+            del self._l1_cache[key]
+            return None
+            
+        self._l1_cache.move_to_end(key)
+        return list(results)
+    
+    def _l1_put(self, key: Tuple[str, float], results: List[SearchHit]):
+        """Store search results in the in-process cache, evicting the oldest entry."""
+        self._l1_cache[key] = (time.monotonic() + self.L1_CACHE_TTL, list(results))
+        self._l1_cache.move_to_end(key)
+        if len(self._l1_cache) > self.L1_CACHE_SIZE:
+            self._l1_cache.popitem(last=False)
+    
     def _generate_cache_key(self, query: str, k: int, filter_dict: Dict) -> str:
         """Generate a deterministic cache key for search queries."""
-        key_parts = [query, str(k)]
-        
-        if filter_dict:
-            # Sort filter dict items for deterministic ordering
-            sorted_filters = sorted(filter_dict.items())
-            for key, value in sorted_filters:
-                key_parts.append(f"{key}:{value}")
-                
-        return self.cache_manager._compute_hash(":".join(key_parts))
+        # Keys change whenever the indexed documents do, so results cached
+        # before an ingest are never served after it
+        generation = (
+            f"{self._cache_gen}:{len(self.local_mode.store.texts)}"
+            f":{len(self.cloud_mode.store.texts)}"
+        )
+        try:
+            return _build_cache_key(query, k, frozenset(filter_dict.items()), generation)
+        except TypeError:
+            # Unhashable filter values - build the key without memoization
+            return _build_cache_key.__wrapped__(query, k, filter_dict.items(), generation)
+    
+    def _invalidate_search_cache(self):
+        """Start a new cache generation after the indexed documents changed."""
+        self._cache_gen += 1
+        self._l1_cache.clear()
     
     def toggle_offline_mode(self, offline: bool):
         """
@@ -294,12 +666,18 @@ class HybridMode(BaseMode):
             offline: Whether to enable offline mode
         """
         self.offline_mode = offline
+        self._schedule_config_save()
         logger.info(f"Offline mode {'enabled' if offline else 'disabled'}")
         
+        # Routing changed, so cached results may come from the wrong side
+        self._l1_cache.clear()
+        
         # Trigger sync when going online
         if not offline and self.cloud_available:
-            asyncio.create_task(self.sync_manager.sync())
+            self._spawn(self.sync_manager.sync())
             self.last_sync_time = time.time()
+            
+        self._wake_background_tasks()
     
     def toggle_prefer_local(self, prefer_local: bool):
         """
@@ -309,6 +687,7 @@ class HybridMode(BaseMode):
             prefer_local: Whether to prefer local processing over cloud
         """
         self.prefer_local = prefer_local
+        self._schedule_config_save()
         logger.info(f"Local processing preference {'enabled' if prefer_local else 'disabled'}")
     
     async def force_sync(self) -> Dict:
@@ -327,6 +706,10 @@ class HybridMode(BaseMode):
         try:
             result = await self.sync_manager.sync(force=True)
             self.last_sync_time = time.time()
+            self._l1_cache.clear()
+            self._schedule_config_save()
+            self._effective_sync_interval = self.sync_interval
+            self._wake_background_tasks()
             return {"status": "success", "details": result}
         except Exception as e:
             logger.error(f"Error during forced sync: {str(e)}")
@@ -352,8 +735,35 @@ class HybridMode(BaseMode):
     def clear_cache(self):
         """Clear the local cache."""
         self.cache_manager.clear()
+        self._l1_cache.clear()
         logger.info("Local cache cleared")
     
+    async def aclose(self):
+        """Cancel background tasks and the ingest pipeline, then close the sync HTTP session."""
+        tasks = [*self._bg_tasks, *self._ingest_workers]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._bg_tasks.clear()
+        
+        # Documents still queued would otherwise leave process_document
+        # waiting forever
+        if self._ingest_workers:
+            for queue in (self._extract_queue, self._upsert_queue):
+                while not queue.empty():
+                    self._fail_ingest(queue.get_nowait()[-1])
+        self._ingest_workers = []
+        self.connection_check_task = None
+        
+        await self.sync_manager.close()
+    
+    def flush(self):
+        """Save local and cloud stores and the config if they have unsaved changes."""
+        self.local_mode.flush()
+        self.cloud_mode.flush()
+        if self._config_dirty:
+            self._save_config()
+    
     def save(self):
         """Save current state of both local and cloud stores."""
         self.local_mode.save()
@@ -364,7 +774,10 @@ class HybridMode(BaseMode):
             except Exception as e:
                 logger.error(f"Error saving cloud store: {str(e)}")
                 
-        # Save hybrid mode configuration
+        self._save_config()
+        
+    def _save_config(self):
+        """Atomically write the hybrid mode configuration."""
         config_path = self.local_mode.storage_path / "hybrid_config.json"
         config = {
             "offline_mode": self.offline_mode,
@@ -374,7 +787,11 @@ class HybridMode(BaseMode):
             "cloud_endpoint": self.cloud_mode.cloud_endpoint
         }
         
-        with open(config_path, 'w') as f:
-            json.dump(config, f)
+        # Write a temporary file and swap it in, so readers never see a
+        # partially written config
+        tmp_path = config_path.with_suffix(".json.tmp")
+        json_utils.dump_file(config, tmp_path)
+        os.replace(tmp_path, config_path)
+        self._config_dirty = False
             
         logger.info("Hybrid mode configuration saved")
\ No newline at end of file
@@ -1,8 +1,9 @@
 from enum import Enum
 from typing import Optional
-import json
 import os
 
+from ..utils import json_utils
+
 class Mode(Enum):
     PRIVATE = "private"
     PUBLIC = "public"
@@ -15,15 +16,13 @@ class ModeManager:
     def load_mode(self) -> Mode:
         """Load mode from config or return default"""
         if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
-                return Mode(config.get("mode", Mode.PRIVATE.value))
+            config = json_utils.load_file(self.config_path)
+            return Mode(config.get("mode", Mode.PRIVATE.value))
         return Mode.PRIVATE
     
     def save_mode(self) -> None:
         """Save current mode to config"""
-        with open(self.config_path, 'w') as f:
-            json.dump({"mode": self.current_mode.value}, f)
+        json_utils.dump_file({"mode": self.current_mode.value}, self.config_path)
     
     def switch_mode(self, mode: Mode) -> None:
         """Switch to specified mode"""
@@ -1,9 +1,24 @@
 """
 Virtual patient module initialization.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+the package alone stays cheap.
 """
 
-from .patient_model import VirtualPatient, VitalSign, Symptom, MedicalHistory, PhysicalExam, LabResult, ImagingStudy
-from .case_generator import CaseGenerator
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    'VirtualPatient': '.patient_model',
+    'VitalSign': '.patient_model',
+    'Symptom': '.patient_model',
+    'MedicalHistory': '.patient_model',
+    'PhysicalExam': '.patient_model',
+    'LabResult': '.patient_model',
+    'ImagingStudy': '.patient_model',
+    'CaseGenerator': '.case_generator',
+    'CaseBatch': '.case_generator'
+}
 
 __all__ = [
     'VirtualPatient',
@@ -13,5 +28,20 @@ __all__ = [
     'PhysicalExam',
     'LabResult',
     'ImagingStudy',
-    'CaseGenerator'
-]
\ No newline at end of file
+    'CaseGenerator',
+    'CaseBatch'
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
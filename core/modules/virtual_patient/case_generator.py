@@ -5,14 +5,24 @@ Creates realistic medical cases with varying complexity levels.
 
 import json
 import random
-import uuid
 import os
+import re
+import secrets
 from typing import Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 import logging
 from datetime import datetime, timedelta
+import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 
+import numpy as np
+
+from ...utils import json_utils
 from .patient_model import (
     VirtualPatient, 
     VitalSign, 
@@ -25,14 +35,197 @@ from .patient_model import (
 
 logger = logging.getLogger(__name__)
 
+# Any single-level {...} group in a pattern
+_BRACES_RE = re.compile(r'\{([^{}]*)\}')
+
+# Names of simple placeholders like {duration}
+_PLACEHOLDER_NAME_RE = re.compile(r'[a-z_]+')
+
+# Segment kinds produced by _compile_pattern
+_LITERAL, _PLACEHOLDER, _CHOICE = 0, 1, 2
+
+@lru_cache(maxsize=4096)
+def _compile_pattern(pattern: str) -> Tuple[Tuple[int, str], ...]:
+    """
+    Split a pattern into (kind, text) segments.
+    
+    Literal text, simple placeholders like {duration} and choices like
+    {option1|option2} become separate segments, so the regex work is done
+    once per distinct pattern and rendering only walks the segments.
+    Braces that are neither stay literal text.
+    """
+    segments = []
+    position = 0
+    for match in _BRACES_RE.finditer(pattern):
+        inner = match.group(1)
+        if "|" in inner:
+            segment = (_CHOICE, inner)
+        elif _PLACEHOLDER_NAME_RE.fullmatch(inner):
+            segment = (_PLACEHOLDER, inner)
+        else:
+            continue
+        if match.start() > position:
+            segments.append((_LITERAL, pattern[position:match.start()]))
+        segments.append(segment)
+        position = match.end()
+    if position < len(pattern):
+        segments.append((_LITERAL, pattern[position:]))
+    return tuple(segments)
+
+@lru_cache(maxsize=64)
+def _display_name(name: str) -> str:
+    """Display form of a vital sign key, e.g. heart_rate -> Heart Rate."""
+    return name.replace("_", " ").title()
+
+class _PatternValues(dict):
+    """
+    Placeholder and choice values for one rendering of a pattern.
+    
+    Like a str.format_map mapping: a value is drawn on first lookup and
+    reused for repeats of the same placeholder or choice. Unknown
+    placeholders map to themselves.
+    """
+    
+    __slots__ = ("rng", "case_patterns")
+    
+    def __init__(self, rng: random.Random, case_patterns: Dict):
+        super().__init__()
+        self.rng = rng
+        self.case_patterns = case_patterns
+    
+    def __missing__(self, key: str) -> str:
+        if "|" in key:
+            value = self.rng.choice(key.split("|"))
+        elif key in self.case_patterns:
+            values = self.case_patterns[key]
+            value = str(self.rng.choice(values) if isinstance(values, list) else values)
+        else:
+            value = f"{{{key}}}"
+        self[key] = value
+        return value
+
+# Parsed templates by specialty directory: path -> (directory mtime, templates).
+# Adding, removing or renaming a template file changes the directory mtime
+# and invalidates the entry; files edited in place are picked up on restart.
+_TEMPLATE_CACHE: Dict[str, Tuple[int, List[Dict]]] = {}
+
+def _read_template(path: str) -> Optional[Dict]:
+    """Parse one template file, or None if it is not valid JSON."""
+    try:
+        return json_utils.load_file(path)
+    except json.JSONDecodeError:
+        logger.error(f"Error parsing template file: {path}")
+        return None
+
+def _fill_uniform(rng: np.random.Generator, lows: np.ndarray, highs: np.ndarray, out: np.ndarray) -> None:
+    """
+    Fill out in place with uniform draws in [lows, highs).
+    
+    Values are rounded to one decimal and clamped to the bounds (rounding
+    can step just past one). Every step is a NumPy kernel that releases
+    the GIL, so disjoint row blocks can be filled from several threads.
+    """
+    rng.random(out=out)
+    out *= highs - lows
+    out += lows
+    np.round(out, 1, out=out)
+    np.clip(out, lows, highs, out=out)
+
+def _to_dict(obj: Any) -> Dict:
+    """JSON encoder default: serialize model objects through to_dict()."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Generator copy used by batch_generate worker processes
+_WORKER_GENERATOR: Optional["CaseGenerator"] = None
+
+def _init_batch_worker(generator: "CaseGenerator") -> None:
+    """Process pool initializer: keep the unpickled generator."""
+    global _WORKER_GENERATOR
+    _WORKER_GENERATOR = generator
+
+def _generate_and_save(
+    seed_seq: np.random.SeedSequence,
+    jobs: List[Tuple[str, int]],
+    output_path: Path
+) -> List[str]:
+    """Generate and save one chunk of a batch in a worker process."""
+    _WORKER_GENERATOR._reseed(seed_seq)
+    return _WORKER_GENERATOR._generate_and_save(jobs, output_path)
+
+@dataclass
+class CaseBatch:
+    """
+    Struct-of-arrays batch of cases generated from one template.
+    
+    Numeric fields are kept as NumPy columns (one row per case), so
+    consumers that only need arrays never build patient objects. Indexing
+    the batch materializes a VirtualPatient for that row on demand; the
+    row is kept, so indexing it again returns the same patient.
+    """
+    generator: "CaseGenerator"
+    template: Dict
+    ages: np.ndarray              # (n,) int16
+    genders: np.ndarray           # (n,) int8, index into gender_options
+    gender_options: Tuple[str, ...]
+    first_names: np.ndarray       # (n,) int8, index into the gender's first-name pool
+    last_names: np.ndarray        # (n,) int8, index into CaseGenerator._LAST_NAMES
+    vital_names: Tuple[str, ...]  # vital sign keys in template order
+    vital_widths: Tuple[int, ...] # components per vital sign (2 for blood pressure)
+    vitals: np.ndarray            # (n, sum(vital_widths)) float32
+    _rows: Dict[int, VirtualPatient] = field(default_factory=dict, repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.ages)
+    
+    def __getitem__(self, i: int) -> VirtualPatient:
+        """The VirtualPatient for row i, built on first access."""
+        i = range(len(self))[i]
+        patient = self._rows.get(i)
+        if patient is None:
+            # Concurrent first accesses keep whichever patient landed first
+            patient = self._rows.setdefault(i, self._build_row(i))
+        return patient
+    
+    def _build_row(self, i: int) -> VirtualPatient:
+        """Build the VirtualPatient for row i."""
+        gender = self.gender_options[self.genders[i]]
+        first_name = self.generator._first_name_pool(gender)[self.first_names[i]]
+        demographics = {
+            "name": f"{first_name} {self.generator._LAST_NAMES[self.last_names[i]]}",
+            "age": int(self.ages[i]),
+            "gender": gender
+        }
+        # float32 storage: round back to the one decimal that was drawn
+        samples = self.vitals[i].astype(np.float64).round(1).tolist()
+        skeleton = self.generator._template_skeleton(self.template)
+        vital_signs = self.generator._generate_vital_signs(skeleton, samples)
+        return self.generator._build_patient(skeleton, demographics, vital_signs)
+
 class CaseGenerator:
     """Generator for virtual patient cases with varying complexity."""
     
+    # Number of templates whose precomputed skeleton is kept
+    SKELETON_CACHE_SIZE = 1024
+    
+    # Name pools for generated patients
+    _MALE_FIRST_NAMES = ("James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph", "Thomas", "Charles")
+    _FEMALE_FIRST_NAMES = ("Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Sarah", "Karen")
+    _LAST_NAMES = ("Smith", "Johnson", "Williams", "Jones", "Brown", "Davis", "Miller", "Wilson", "Moore", "Taylor")
+    
+    # Batches with at least this many rows fill their vitals from
+    # BATCH_WORKERS threads
+    PARALLEL_BATCH_ROWS = 50_000
+    BATCH_WORKERS = min(8, os.cpu_count() or 1)
+    
     def __init__(
         self,
         templates_path: Union[str, Path],
         difficulty_level: int = 1,  # 1-5 scale
-        specialties: Optional[List[str]] = None
+        specialties: Optional[List[str]] = None,
+        seed: Optional[int] = None,
+        persist_generated: bool = True
     ):
         """
         Initialize case generator.
@@ -41,10 +234,24 @@ class CaseGenerator:
             templates_path: Path to case templates directory
             difficulty_level: Default difficulty level (1-5)
             specialties: List of medical specialties to include
+            seed: Optional seed for reproducible case generation
+            persist_generated: Write generated basic templates to
+                templates_path (skipped anyway if it is not writable)
         """
         self.templates_path = Path(templates_path)
         self.difficulty_level = max(1, min(5, difficulty_level))
-        self.specialties = specialties or [
+        self.persist_generated = persist_generated
+        
+        # Private generators per thread: no shared module state or lock, and
+        # NumPy generators must not be used from several threads at once.
+        # Each thread gets its own stream spawned from the seed; the
+        # constructing thread always gets the first one.
+        self._seed_seq = np.random.SeedSequence(seed)
+        self._seed_lock = threading.Lock()
+        self._local = threading.local()
+        self._init_thread_rngs()
+        # Categorical strings are interned so every case shares one copy
+        self.specialties = [sys.intern(specialty) for specialty in specialties or [
             "internal_medicine",
             "pediatrics",
             "cardiology",
@@ -53,42 +260,135 @@ class CaseGenerator:
             "gastroenterology",
             "nephrology",
             "endocrinology"
-        ]
+        ]]
         
-        # Load templates
+        # Candidate templates per (specialty, difficulty), filled lazily and
+        # reset whenever self.templates is reassigned
+        self._difficulty_index: Dict[Tuple[str, int], Tuple[Dict, ...]] = {}
+        
+        # Load templates; parsed once and kept in memory
         self.templates = self._load_templates()
         
+        # Template id -> (template, skeleton); the template is kept so its
+        # id cannot be reused while the entry exists
+        self._skeletons: OrderedDict = OrderedDict()
+        
         # Load case patterns
         self.case_patterns = self._load_case_patterns()
     
+    def __getstate__(self) -> Dict:
+        # Locks, thread-local generators and the id-keyed skeleton cache do
+        # not survive pickling; they are rebuilt in __setstate__
+        state = self.__dict__.copy()
+        for name in ("_seed_lock", "_local", "_skeletons"):
+            del state[name]
+        state["_difficulty_index"] = {}
+        return state
+    
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._seed_lock = threading.Lock()
+        self._local = threading.local()
+        self._skeletons = OrderedDict()
+        self._init_thread_rngs()
+    
+    def _reseed(self, seed_seq: np.random.SeedSequence):
+        """Restart random streams from seed_seq (threads pick it up lazily)."""
+        with self._seed_lock:
+            self._seed_seq = seed_seq
+        self._local = threading.local()
+        self._init_thread_rngs()
+    
+    def _init_thread_rngs(self) -> Tuple[random.Random, np.random.Generator]:
+        """Create this thread's generators from the next spawned seed."""
+        with self._seed_lock:
+            child = self._seed_seq.spawn(1)[0]
+        self._local.rng = random.Random(int(child.generate_state(1, np.uint64)[0]))
+        self._local.np_rng = np.random.default_rng(child)
+        return self._local.rng, self._local.np_rng
+    
+    @property
+    def _rng(self) -> random.Random:
+        """This thread's generator for choices and scalar draws."""
+        try:
+            return self._local.rng
+        except AttributeError:
+            return self._init_thread_rngs()[0]
+    
+    @property
+    def _np_rng(self) -> np.random.Generator:
+        """This thread's generator for vectorized numeric draws."""
+        try:
+            return self._local.np_rng
+        except AttributeError:
+            return self._init_thread_rngs()[1]
+    
+    @property
+    def templates(self) -> Dict:
+        """Loaded case templates by specialty."""
+        return self._templates
+    
+    @templates.setter
+    def templates(self, templates: Dict):
+        self._templates = templates
+        self._difficulty_index.clear()
+    
     def _load_templates(self) -> Dict:
         """Load all available case templates."""
         templates = {}
         
         try:
             # Ensure templates directory exists
-            os.makedirs(self.templates_path, exist_ok=True)
+            if self._can_persist():
+                os.makedirs(self.templates_path, exist_ok=True)
             
-            # Load templates for each specialty
+            # Cached specialties are reused; the rest have their template
+            # files listed here and read together below
+            loaded = {}
+            pending = []
             for specialty in self.specialties:
                 specialty_path = self.templates_path / specialty
                 
-                if not specialty_path.exists():
+                try:
+                    mtime = specialty_path.stat().st_mtime_ns
+                except FileNotFoundError:
                     logger.warning(f"No templates found for specialty: {specialty}")
                     continue
                 
-                specialty_templates = []
-                
-                # Load each template file
-                for template_file in specialty_path.glob("*.json"):
-                    try:
-                        with open(template_file, 'r') as f:
-                            template = json.load(f)
-                            specialty_templates.append(template)
-                    except json.JSONDecodeError:
-                        logger.error(f"Error parsing template file: {template_file}")
+                cached = _TEMPLATE_CACHE.get(str(specialty_path))
+                if cached is not None and cached[0] == mtime:
+                    loaded[specialty] = cached[1]
+                    continue
                 
-                templates[specialty] = specialty_templates
+                # scandir yields plain paths and cached file types, no Path
+                # objects or glob matching
+                with os.scandir(specialty_path) as entries:
+                    paths = [
+                        entry.path for entry in entries
+                        if entry.name.endswith(".json") and entry.is_file()
+                    ]
+                pending.append((specialty, str(specialty_path), mtime, paths))
+            
+            # Template files are independent; read them on a thread pool so
+            # startup pays for the disk latency once rather than per file
+            all_paths = [path for _, _, _, paths in pending for path in paths]
+            if len(all_paths) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.BATCH_WORKERS, len(all_paths))) as executor:
+                    parsed = list(executor.map(_read_template, all_paths))
+            else:
+                parsed = [_read_template(path) for path in all_paths]
+            
+            offset = 0
+            for specialty, key, mtime, paths in pending:
+                specialty_parsed = parsed[offset:offset + len(paths)]
+                offset += len(paths)
+                specialty_templates = [template for template in specialty_parsed if template is not None]
+                _TEMPLATE_CACHE[key] = (mtime, specialty_templates)
+                loaded[specialty] = specialty_templates
+            
+            for specialty, specialty_templates in loaded.items():
+                # Own list per generator; the template dicts are shared
+                templates[specialty] = list(specialty_templates)
                 logger.info(f"Loaded {len(specialty_templates)} templates for {specialty}")
             
             # If no templates were found, generate some basic templates
@@ -242,6 +542,12 @@ class CaseGenerator:
             }
         ]
         
+        # Ephemeral or read-only deployments regenerate them in memory on
+        # every start instead
+        if not self._can_persist():
+            logger.info("Generated basic templates (not saved)")
+            return templates
+        
         # Save generated templates
         for specialty, specialty_templates in templates.items():
             specialty_path = self.templates_path / specialty
@@ -249,12 +555,22 @@ class CaseGenerator:
             
             for idx, template in enumerate(specialty_templates):
                 template_path = specialty_path / f"{template['name'].lower().replace(' ', '_')}_{idx}.json"
-                with open(template_path, 'w') as f:
-                    json.dump(template, f, indent=2)
+                json_utils.dump_file(template, template_path, indent=True)
         
         logger.info("Generated and saved basic templates")
         return templates
     
+    def _can_persist(self) -> bool:
+        """Whether generated templates may be written under templates_path."""
+        if not self.persist_generated:
+            return False
+        
+        # The directory may not exist yet; check what would be created in
+        path = self.templates_path
+        while not path.exists() and path != path.parent:
+            path = path.parent
+        return os.access(path, os.W_OK)
+    
     def _load_case_patterns(self) -> Dict:
         """Load case patterns for generating variations."""
         # These are patterns used to add variety to generated cases
@@ -301,8 +617,26 @@ class CaseGenerator:
             available_specialties = list(self.templates.keys())
             if not available_specialties:
                 raise ValueError("No templates available")
-            specialty = random.choice(available_specialties)
+            specialty = self._rng.choice(available_specialties)
         
+        # Randomly select a template
+        key = (specialty, difficulty)
+        candidates = self._difficulty_index.get(key)
+        if candidates is None:
+            candidates = self._difficulty_index[key] = self._filter_templates(specialty, difficulty)
+        return self._rng.choice(candidates)
+    
+    def _filter_templates(self, specialty: str, difficulty: int) -> Tuple[Dict, ...]:
+        """
+        Templates of a specialty matching a difficulty.
+        
+        Args:
+            specialty: Medical specialty
+            difficulty: Case difficulty
+            
+        Returns:
+            Matching templates, or all templates of the specialty if none match
+        """
         # Get templates for the selected specialty
         specialty_templates = self.templates.get(specialty, [])
         if not specialty_templates:
@@ -312,11 +646,7 @@ class CaseGenerator:
         difficulty_templates = [t for t in specialty_templates if t.get("difficulty", 1) == difficulty]
         
         # If no templates match the difficulty, use all templates
-        if not difficulty_templates:
-            difficulty_templates = specialty_templates
-        
-        # Randomly select a template
-        return random.choice(difficulty_templates)
+        return tuple(difficulty_templates or specialty_templates)
     
     def generate_case(
         self,
@@ -339,176 +669,328 @@ class CaseGenerator:
         if template is None:
             template = self.select_template(specialty, difficulty)
         
-        # Generate a unique ID for the patient
-        patient_id = str(uuid.uuid4())
+        skeleton = self._template_skeleton(template)
         
         # Generate patient demographics
-        demographics = self._generate_demographics(template.get("demographics", {}))
-        
-        # Generate history of present illness
-        history = self._generate_history(template.get("history_patterns", []))
+        demographics = self._generate_demographics(skeleton)
         
         # Generate vital signs
-        vital_signs = self._generate_vital_signs(template.get("vital_sign_patterns", {}))
+        vital_signs = self._generate_vital_signs(skeleton)
         
-        # Generate symptoms
-        symptoms = self._generate_symptoms(template.get("symptoms", []))
+        return self._build_patient(skeleton, demographics, vital_signs)
+    
+    def generate_batch(
+        self,
+        n: int,
+        specialty: Optional[str] = None,
+        difficulty: Optional[int] = None,
+        template: Optional[Dict] = None
+    ) -> CaseBatch:
+        """
+        Generate n cases from one template as NumPy columns.
         
-        # Generate physical exam findings
-        physical_exam = self._generate_physical_exam(template.get("physical_exam_findings", {}))
+        Ages, genders and vital signs for all cases are drawn with one
+        vectorized call each; patients are only built when the batch is
+        indexed.
+        
+        Args:
+            n: Number of cases
+            specialty: Medical specialty (if None, randomly selected)
+            difficulty: Case difficulty (if None, uses default)
+            template: Specific template to use (if None, one is selected)
+            
+        Returns:
+            CaseBatch holding the generated cases
+        """
+        if template is None:
+            template = self.select_template(specialty, difficulty)
+        
+        skeleton = self._template_skeleton(template)
+        age_range = skeleton["age_range"]
+        gender_options = skeleton["gender_options"]
+        lows, highs = skeleton["vital_lows"], skeleton["vital_highs"]
+        
+        vitals = np.empty((n, len(lows)), dtype=np.float64)
+        workers = self.BATCH_WORKERS if n >= self.PARALLEL_BATCH_ROWS else 1
+        if workers > 1:
+            # Independent streams per row block, derived from this
+            # generator so seeded batches stay reproducible
+            seeds = np.random.SeedSequence(int(self._np_rng.integers(1 << 63))).spawn(workers)
+            blocks = np.array_split(vitals, workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(
+                    lambda args: _fill_uniform(np.random.default_rng(args[0]), lows, highs, args[1]),
+                    zip(seeds, blocks)
+                ))
+        else:
+            _fill_uniform(self._np_rng, lows, highs, vitals)
+        
+        genders = self._np_rng.integers(len(gender_options), size=n, dtype=np.int8)
+        first_name_counts = np.array([len(self._first_name_pool(g)) for g in gender_options])
+        
+        return CaseBatch(
+            generator=self,
+            template=template,
+            ages=self._np_rng.integers(age_range[0], age_range[1], size=n, endpoint=True, dtype=np.int16),
+            genders=genders,
+            gender_options=gender_options,
+            first_names=self._np_rng.integers(first_name_counts[genders], dtype=np.int8),
+            last_names=self._np_rng.integers(len(self._LAST_NAMES), size=n, dtype=np.int8),
+            vital_names=tuple(spec[0] for spec in skeleton["vital_specs"]),
+            vital_widths=tuple(spec[3] for spec in skeleton["vital_specs"]),
+            vitals=vitals.astype(np.float32)
+        )
+    
+    def _template_skeleton(self, template: Dict) -> Dict:
+        """
+        Deterministic part of case generation for a template, computed once.
+        
+        Holds everything that does not depend on random draws: demographic
+        ranges, vital sign bounds, normal/critical ranges and the template
+        sections case assembly reads, extracted once.
+        
+        Args:
+            template: Case template
+            
+        Returns:
+            Skeleton dict (shared, treat as read-only)
+        """
+        key = id(template)
+        cached = self._skeletons.get(key)
+        if cached is not None and cached[0] is template:
+            self._skeletons.move_to_end(key)
+            return cached[1]
         
-        # Generate lab results (but don't add them yet - they'll be revealed during the case)
-        lab_results = self._generate_lab_results(template.get("lab_result_patterns", {}))
+        skeleton = self._compose_skeleton(template)
+        self._skeletons[key] = (template, skeleton)
+        if len(self._skeletons) > self.SKELETON_CACHE_SIZE:
+            self._skeletons.popitem(last=False)
+        return skeleton
+    
+    def _compose_skeleton(self, template: Dict) -> Dict:
+        """Build the skeleton of a template (see _template_skeleton)."""
+        demographics = template.get("demographics", {})
+        vital_sign_patterns = template.get("vital_sign_patterns", {})
+        lows, highs = self._vital_bounds(vital_sign_patterns)
+        
+        # (key, display name, paired, width, unit, min_normal, max_normal,
+        # critical_low, critical_high) per vital sign
+        vital_specs = []
+        for name, pattern in vital_sign_patterns.items():
+            if isinstance(pattern.get("min"), list) and isinstance(pattern.get("max"), list):
+                # Blood pressure and similar paired values
+                paired, width = True, len(pattern["min"])
+                if name.lower() == "blood_pressure":
+                    min_normal, max_normal = 90, 140  # Systolic
+                    critical_low, critical_high = 80, 180  # Systolic
+                else:
+                    min_normal, max_normal = pattern.get("reference", [0, 100])
+                    critical_low = min_normal * 0.7
+                    critical_high = max_normal * 1.3
+            else:
+                paired, width = False, 1
+                min_normal, max_normal = pattern.get(
+                    "reference", [pattern.get("min", 0), pattern.get("max", 100)]
+                )
+                critical_low = pattern.get("critical_low", min_normal * 0.7)
+                critical_high = pattern.get("critical_high", max_normal * 1.3)
+            
+            vital_specs.append((
+                name, _display_name(name), paired, width, pattern.get("unit", ""),
+                min_normal, max_normal, critical_low, critical_high
+            ))
         
-        # Generate imaging studies (but don't add them yet - they'll be revealed during the case)
-        imaging_studies = self._generate_imaging_studies(template.get("imaging_patterns", {}))
+        return {
+            "age_range": demographics.get("age_range", [18, 80]),
+            "gender_options": tuple(sys.intern(gender) for gender in demographics.get("gender", ["male", "female"])),
+            "vital_lows": lows,
+            "vital_highs": highs,
+            "vital_specs": tuple(vital_specs),
+            "history_patterns": template.get("history_patterns", []),
+            "symptoms": template.get("symptoms", []),
+            "physical_exam_findings": template.get("physical_exam_findings", {}),
+            "lab_result_patterns": template.get("lab_result_patterns", {}),
+            "imaging_patterns": template.get("imaging_patterns", {}),
+            "medical_history": template.get("medical_history", {}),
+            "chief_complaint": template.get("chief_complaint", ""),
+            "diagnoses": template.get("diagnoses", []),
+            "difficulty": template.get("difficulty"),
+            "expert_reasoning": template.get("expert_reasoning", "")
+        }
+    
+    def _build_patient(self, skeleton: Dict, demographics: Dict, vital_signs: Dict[str, VitalSign]) -> VirtualPatient:
+        """
+        Assemble a virtual patient from a template skeleton.
+        
+        Args:
+            skeleton: Template skeleton (see _template_skeleton)
+            demographics: Generated name, age and gender
+            vital_signs: Generated vital signs
+            
+        Returns:
+            Generated virtual patient
+        """
+        # Generate a unique ID for the patient (128 random bits, as hex)
+        patient_id = secrets.token_hex(16)
+        
+        # One clock reading for every timestamp in the case
+        now = time.time()
+        
+        # Generate history of present illness
+        history = self._generate_history(skeleton["history_patterns"])
+        
+        # Generate symptoms
+        symptoms = self._generate_symptoms(skeleton["symptoms"], now)
+        
+        # Generate physical exam findings
+        physical_exam = self._generate_physical_exam(skeleton["physical_exam_findings"])
         
         # Create the virtual patient
+        difficulty = skeleton["difficulty"]
         patient = VirtualPatient(
             patient_id=patient_id,
             name=demographics["name"],
             age=demographics["age"],
             gender=demographics["gender"],
-            chief_complaint=template.get("chief_complaint", ""),
+            chief_complaint=skeleton["chief_complaint"],
             history_of_present_illness=history,
             vital_signs=vital_signs,
             symptoms=symptoms,
-            medical_history=self._generate_medical_history(template.get("medical_history", {})),
+            medical_history=self._generate_medical_history(skeleton["medical_history"]),
             physical_exam=physical_exam,
             # Lab results and imaging studies are empty to start
             lab_results={},
             imaging_studies=[],
-            diagnoses=template.get("diagnoses", []),
-            scenario_difficulty=template.get("difficulty", self.difficulty_level),
-            expert_reasoning=template.get("expert_reasoning", "")
+            diagnoses=skeleton["diagnoses"],
+            scenario_difficulty=self.difficulty_level if difficulty is None else difficulty,
+            expert_reasoning=skeleton["expert_reasoning"]
         )
         
-        # Store the potential lab results and imaging studies for later revelation
-        patient._potential_lab_results = lab_results
-        patient._potential_imaging_studies = imaging_studies
+        # Lab results and imaging studies are only revealed during the case;
+        # generate them the first time they are needed. Their seeds are drawn
+        # now, so a seeded generator builds the same patient whichever fields
+        # are read later, and in whatever order
+        lab_seed, imaging_seed = self._np_rng.integers(1 << 63, size=2).tolist()
+        patient.defer_potential_results(
+            partial(self._generate_lab_results, skeleton["lab_result_patterns"], now, lab_seed),
+            partial(self._generate_imaging_studies, skeleton["imaging_patterns"], now, imaging_seed)
+        )
         
         return patient
     
-    def _generate_demographics(self, demographics_template: Dict) -> Dict:
-        """Generate patient demographics based on template."""
+    def _generate_demographics(self, skeleton: Dict) -> Dict:
+        """Generate patient demographics based on the template skeleton."""
         # Generate age
-        age_range = demographics_template.get("age_range", [18, 80])
-        age = random.randint(age_range[0], age_range[1])
+        age_range = skeleton["age_range"]
+        age = self._rng.randint(age_range[0], age_range[1])
         
         # Generate gender
-        gender_options = demographics_template.get("gender", ["male", "female"])
-        gender = random.choice(gender_options)
-        
-        # Generate name based on gender
-        if gender.lower() == "male":
-            first_names = ["James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph", "Thomas", "Charles"]
-        else:
-            first_names = ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Sarah", "Karen"]
-            
-        last_names = ["Smith", "Johnson", "Williams", "Jones", "Brown", "Davis", "Miller", "Wilson", "Moore", "Taylor"]
-        
-        name = f"{random.choice(first_names)} {random.choice(last_names)}"
+        gender = self._rng.choice(skeleton["gender_options"])
         
         return {
-            "name": name,
+            "name": self._patient_name(gender),
             "age": age,
             "gender": gender
         }
     
+    def _patient_name(self, gender: str) -> str:
+        """Random full name matching gender."""
+        return f"{self._rng.choice(self._first_name_pool(gender))} {self._rng.choice(self._LAST_NAMES)}"
+    
+    @classmethod
+    def _first_name_pool(cls, gender: str) -> Tuple[str, ...]:
+        """First names used for patients of gender."""
+        return cls._MALE_FIRST_NAMES if gender.lower() == "male" else cls._FEMALE_FIRST_NAMES
+    
     def _generate_history(self, history_patterns: List[str]) -> str:
         """Generate history of present illness from patterns."""
         if not history_patterns:
             return "Patient presents with chief complaint."
             
-        # Process each pattern, replacing placeholders with values
-        processed_patterns = []
-        for pattern in history_patterns:
-            processed = self._process_pattern(pattern)
-            processed_patterns.append(processed)
-            
-        # Join the patterns into a complete history
-        return " ".join(processed_patterns)
-    
-    def _process_pattern(self, pattern: str) -> str:
-        """Process a pattern string, replacing placeholders with values."""
-        # Handle simple placeholders like {duration}
-        for placeholder, values in self.case_patterns.items():
-            if f"{{{placeholder}}}" in pattern:
-                value = random.choice(values) if isinstance(values, list) else values
-                pattern = pattern.replace(f"{{{placeholder}}}", str(value))
-                
-        # Handle choice placeholders like {option1|option2|option3}
-        import re
-        choice_pattern = r'\{([^{}]*\|[^{}]*)\}'
-        choices = re.findall(choice_pattern, pattern)
-        for choice_str in choices:
-            options = choice_str.split('|')
-            replacement = random.choice(options)
-            pattern = pattern.replace(f"{{{choice_str}}}", replacement)
-            
-        return pattern
-    
-    def _generate_vital_signs(self, vital_sign_patterns: Dict) -> Dict[str, VitalSign]:
-        """Generate vital signs based on patterns."""
+        # Process each pattern straight into the joined history
+        return " ".join(self._process_pattern(pattern) for pattern in history_patterns)
+    
+    def _process_pattern(self, pattern: str, rng: Optional[random.Random] = None) -> str:
+        """Process a pattern string, replacing placeholders with values drawn from rng."""
+        # Most exam and imaging lines are plain text
+        if "{" not in pattern:
+            return pattern
+        
+        # One pass over the compiled segments; repeated placeholders and
+        # choices in one pattern get the same value
+        values = _PatternValues(rng or self._rng, self.case_patterns)
+        return "".join(
+            text if kind == _LITERAL else values[text] for kind, text in _compile_pattern(pattern)
+        )
+    
+    @staticmethod
+    def _vital_bounds(vital_sign_patterns: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat (lows, highs) arrays over every vital sign component."""
+        lows = []
+        highs = []
+        for pattern in vital_sign_patterns.values():
+            min_value = pattern.get("min", 0)
+            max_value = pattern.get("max", 100)
+            if isinstance(min_value, list) and isinstance(max_value, list):
+                lows.extend(min_value)
+                highs.extend(max_value)
+            else:
+                lows.append(min_value)
+                highs.append(max_value)
+        return np.asarray(lows, dtype=np.float64), np.asarray(highs, dtype=np.float64)
+    
+    def _generate_vital_signs(
+        self,
+        skeleton: Dict,
+        samples: Optional[List[float]] = None
+    ) -> Dict[str, VitalSign]:
+        """
+        Generate vital signs based on the template skeleton.
+        
+        Args:
+            skeleton: Template skeleton from _template_skeleton
+            samples: Pre-drawn values for every component, in pattern order
+                (drawn here if omitted)
+            
+        Returns:
+            Vital signs by name
+        """
         vital_signs = {}
         
-        for name, pattern in vital_sign_patterns.items():
-            if isinstance(pattern.get("min"), list) and isinstance(pattern.get("max"), list):
-                # Handle blood pressure and similar paired values
-                min_values = pattern["min"]
-                max_values = pattern["max"]
-                
-                # Generate a value within the range for each component
-                values = []
-                for i in range(len(min_values)):
-                    value = random.uniform(min_values[i], max_values[i])
-                    values.append(round(value, 1))
-                
+        # Draw every component of every vital sign in one vectorized call
+        if samples is None:
+            lows, highs = skeleton["vital_lows"], skeleton["vital_highs"]
+            samples = np.clip(self._np_rng.uniform(lows, highs).round(1), lows, highs).tolist()
+        offset = 0
+        
+        for (name, display_name, paired, width, unit,
+             min_normal, max_normal, critical_low, critical_high) in skeleton["vital_specs"]:
+            if width == 2:
                 # Format the value (e.g., "120/80")
-                current_value = "/".join(str(v) for v in values)
-                
-                # Use the systolic value as the numerical value for comparison
-                numerical_value = values[0]
-                
-                # Define normal ranges
-                if name.lower() == "blood_pressure":
-                    min_normal, max_normal = 90, 140  # Systolic
-                    critical_low, critical_high = 80, 180  # Systolic
-                else:
-                    min_normal, max_normal = pattern.get("reference", [0, 100])
-                    critical_low = min_normal * 0.7
-                    critical_high = max_normal * 1.3
+                current_value = f"{samples[offset]}/{samples[offset + 1]}"
+            elif paired:
+                current_value = "/".join(str(v) for v in samples[offset:offset + width])
             else:
-                # Handle single values
-                min_value = pattern.get("min", 0)
-                max_value = pattern.get("max", 100)
-                
-                # Generate a value within the range
-                numerical_value = random.uniform(min_value, max_value)
-                current_value = round(numerical_value, 1)
-                
-                # Define normal ranges
-                min_normal, max_normal = pattern.get("reference", [min_value, max_value])
-                critical_low = pattern.get("critical_low", min_normal * 0.7)
-                critical_high = pattern.get("critical_high", max_normal * 1.3)
+                current_value = samples[offset]
+            offset += width
             
             # Create the vital sign
-            vital_sign = VitalSign(
-                name=name.replace("_", " ").title(),
+            vital_signs[name] = VitalSign(
+                name=display_name,
                 current_value=current_value,
-                unit=pattern.get("unit", ""),
+                unit=unit,
                 min_normal=min_normal,
                 max_normal=max_normal,
                 critical_low=critical_low,
                 critical_high=critical_high
             )
             
-            vital_signs[name] = vital_sign
-            
         return vital_signs
     
-    def _generate_symptoms(self, symptom_patterns: List[Dict]) -> List[Symptom]:
-        """Generate symptoms based on patterns."""
+    def _generate_symptoms(self, symptom_patterns: List[Dict], now: Optional[float] = None) -> List[Symptom]:
+        """Generate symptoms based on patterns, relative to now."""
+        if now is None:
+            now = time.time()
         symptoms = []
         
         for pattern in symptom_patterns:
@@ -516,14 +998,14 @@ class CaseGenerator:
             
             # Generate severity within the specified range
             severity_range = pattern.get("severity_range", [1, 10])
-            severity = random.randint(severity_range[0], severity_range[1])
+            severity = self._rng.randint(severity_range[0], severity_range[1])
             
             # Generate onset time (between 1 hour and 30 days ago)
             max_onset_days = pattern.get("max_onset_days", 30)
-            onset_time = time.time() - random.uniform(3600, max_onset_days * 86400)
+            onset_time = now - self._rng.uniform(3600, max_onset_days * 86400)
             
             # Generate duration
-            duration = pattern.get("duration", time.time() - onset_time)
+            duration = pattern.get("duration", now - onset_time)
             
             # Create the symptom
             symptom = Symptom(
@@ -562,15 +1044,10 @@ class CaseGenerator:
             
             # Process patterns for this system
             if isinstance(system_data, dict) and "patterns" in system_data:
-                patterns = system_data["patterns"]
-                findings = []
-                
-                for pattern in patterns:
-                    processed = self._process_pattern(pattern)
-                    findings.append(processed)
-                    
                 # Update description and findings
-                systems[system_name]["description"] = " ".join(findings)
+                systems[system_name]["description"] = " ".join(
+                    self._process_pattern(pattern) for pattern in system_data["patterns"]
+                )
                 
                 # Add specific findings if provided
                 if "findings" in system_data:
@@ -595,28 +1072,44 @@ class CaseGenerator:
         # This would be expanded with more sophisticated logic in a real implementation
         return MedicalHistory()
     
-    def _generate_lab_results(self, lab_patterns: Dict) -> Dict[str, LabResult]:
-        """Generate laboratory results based on patterns."""
+    def _generate_lab_results(
+        self,
+        lab_patterns: Dict,
+        now: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, LabResult]:
+        """Generate laboratory results based on patterns, timestamped now (from seed if given)."""
+        rng = self._np_rng if seed is None else np.random.default_rng(seed)
+        if now is None:
+            now = time.time()
         lab_results = {}
         
+        # Draw all numeric components and flag critical values in one
+        # vectorized pass
+        bounds = []
+        for test_patterns in lab_patterns.values():
+            for component_pattern in test_patterns.values():
+                if "min" in component_pattern and "max" in component_pattern:
+                    reference_range = component_pattern.get("reference", [0, 100])
+                    bounds.append((
+                        component_pattern["min"], component_pattern["max"],
+                        reference_range[0], reference_range[1]
+                    ))
+        
+        lows, highs, reference_lows, reference_highs = np.asarray(bounds, dtype=np.float64).reshape(-1, 4).T
+        values = np.clip(rng.uniform(lows, highs).round(1), lows, highs)
+        
+        # Critical below half the (positive) lower limit or above 1.5x the upper
+        critical_mask = ((reference_lows > 0) & (values < reference_lows * 0.5)) | (values > reference_highs * 1.5)
+        samples = zip(values.tolist(), critical_mask.tolist())
+        
         for test_name, test_patterns in lab_patterns.items():
             for component_name, component_pattern in test_patterns.items():
                 # Handle numeric values
                 if "min" in component_pattern and "max" in component_pattern:
-                    min_value = component_pattern["min"]
-                    max_value = component_pattern["max"]
-                    value = round(random.uniform(min_value, max_value), 1)
-                    
-                    # Get reference range
+                    value, critical = next(samples)
                     reference_range = component_pattern.get("reference", [0, 100])
                     
-                    # Determine if it's critical
-                    critical = False
-                    if reference_range[0] > 0 and value < reference_range[0] * 0.5:
-                        critical = True
-                    elif value > reference_range[1] * 1.5:
-                        critical = True
-                        
                 # Handle non-numeric values
                 else:
                     value = component_pattern.get("value", "")
@@ -624,40 +1117,46 @@ class CaseGenerator:
                     critical = component_pattern.get("critical", False)
                 
                 # Create the lab result
-                result_name = f"{test_name} - {component_name}"
+                result_name = sys.intern(f"{test_name} - {component_name}")
                 lab_results[result_name] = LabResult(
                     name=result_name,
                     value=value,
                     unit=component_pattern.get("unit", ""),
                     reference_range=reference_range,
-                    timestamp=time.time(),
+                    timestamp=now,
                     critical=critical
                 )
                 
         return lab_results
     
-    def _generate_imaging_studies(self, imaging_patterns: Dict) -> List[ImagingStudy]:
-        """Generate imaging studies based on patterns."""
+    def _generate_imaging_studies(
+        self,
+        imaging_patterns: Dict,
+        now: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> List[ImagingStudy]:
+        """Generate imaging studies based on patterns, timestamped now (from seed if given)."""
+        rng = self._rng if seed is None else random.Random(seed)
+        if now is None:
+            now = time.time()
         imaging_studies = []
         
         for study_name, study_pattern in imaging_patterns.items():
-            # Process findings patterns
-            findings = []
-            for pattern in study_pattern.get("findings_patterns", []):
-                findings.append(self._process_pattern(pattern))
-                
-            # Process impression patterns
-            impressions = []
-            for pattern in study_pattern.get("impression_patterns", []):
-                impressions.append(self._process_pattern(pattern))
-                
+            # Process findings and impression patterns
+            findings = " ".join(
+                self._process_pattern(pattern, rng) for pattern in study_pattern.get("findings_patterns", [])
+            )
+            impression = " ".join(
+                self._process_pattern(pattern, rng) for pattern in study_pattern.get("impression_patterns", [])
+            )
+            
             # Create the imaging study
             study = ImagingStudy(
                 name=study_name,
                 modality=study_pattern.get("modality", study_name),
-                findings=" ".join(findings),
-                impression=" ".join(impressions),
-                timestamp=time.time(),
+                findings=findings,
+                impression=impression,
+                timestamp=now,
                 images=study_pattern.get("images", [])
             )
             
@@ -686,20 +1185,16 @@ class CaseGenerator:
         # Convert patient to dictionary
         patient_dict = patient.to_dict()
         
-        # Add potential lab results and imaging studies if available
+        # Add potential lab results and imaging studies if available; the
+        # encoder serializes the objects through _to_dict as it reaches them
         if hasattr(patient, "_potential_lab_results"):
-            patient_dict["_potential_lab_results"] = {
-                name: result.to_dict() for name, result in patient._potential_lab_results.items()
-            }
+            patient_dict["_potential_lab_results"] = patient._potential_lab_results
             
         if hasattr(patient, "_potential_imaging_studies"):
-            patient_dict["_potential_imaging_studies"] = [
-                study.to_dict() for study in patient._potential_imaging_studies
-            ]
+            patient_dict["_potential_imaging_studies"] = patient._potential_imaging_studies
         
         # Save to file
-        with open(file_path, 'w') as f:
-            json.dump(patient_dict, f, indent=2)
+        json_utils.dump_file(patient_dict, file_path, indent=True, default=_to_dict)
             
         logger.info(f"Saved patient to {file_path}")
         return str(file_path)
@@ -709,7 +1204,8 @@ class CaseGenerator:
         count: int,
         output_path: Union[str, Path],
         specialties: Optional[List[str]] = None,
-        difficulty_range: Optional[Tuple[int, int]] = None
+        difficulty_range: Optional[Tuple[int, int]] = None,
+        workers: Optional[int] = None
     ) -> List[str]:
         """
         Generate multiple virtual patient cases.
@@ -719,6 +1215,8 @@ class CaseGenerator:
             output_path: Directory to save the files
             specialties: List of specialties to use (if None, uses all available)
             difficulty_range: Range of difficulties to use (if None, uses default)
+            workers: Worker processes to spread the cases over (if None or 1,
+                generates in this process)
             
         Returns:
             List of paths to saved files
@@ -733,14 +1231,50 @@ class CaseGenerator:
         # Use provided difficulty range or default
         min_difficulty, max_difficulty = difficulty_range or (1, 5)
         
-        # Generate patients
+        # Select specialty and difficulty for all patients up front in two
+        # vectorized draws
+        specialty_idx = self._np_rng.integers(0, len(specialties), size=count)
+        difficulties = self._np_rng.integers(min_difficulty, max_difficulty + 1, size=count)
+        
+        jobs = [
+            (specialties[i], difficulty)
+            for i, difficulty in zip(specialty_idx.tolist(), difficulties.tolist())
+        ]
+        
+        if not workers or workers <= 1 or count <= 1:
+            return self._generate_and_save(jobs, output_path)
+        
+        # Cases are independent; split them into chunks, each generated from
+        # its own spawned seed so the output does not depend on scheduling
+        n_chunks = min(count, workers * 4)
+        chunk_size = -(-count // n_chunks)
+        chunks = [jobs[start:start + chunk_size] for start in range(0, count, chunk_size)]
+        with self._seed_lock:
+            seeds = self._seed_seq.spawn(len(chunks))
+        
         saved_paths = []
-        for _ in range(count):
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self,)
+        ) as executor:
+            futures = [
+                executor.submit(_generate_and_save, seed, chunk, output_path)
+                for seed, chunk in zip(seeds, chunks)
+            ]
+            for future in futures:
+                try:
+                    saved_paths.extend(future.result())
+                except Exception as e:
+                    logger.error(f"Error generating patients: {str(e)}")
+        
+        return saved_paths
+    
+    def _generate_and_save(self, jobs: List[Tuple[str, int]], output_path: Path) -> List[str]:
+        """Generate and save a patient per (specialty, difficulty) job."""
+        saved_paths = []
+        for specialty, difficulty in jobs:
             try:
-                # Select random specialty and difficulty
-                specialty = random.choice(specialties)
-                difficulty = random.randint(min_difficulty, max_difficulty)
-                
                 # Generate patient
                 patient = self.generate_case(specialty=specialty, difficulty=difficulty)
                 
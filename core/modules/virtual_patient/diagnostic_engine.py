@@ -74,9 +74,23 @@ class DiagnosticEngine:
         Returns:
             Score (0-100)
         """
-        # Placeholder implementation
-        # The full implementation will provide more comprehensive scoring
-        return 75.0
+        # Same scoring as VirtualPatient.evaluate_diagnosis: each actual
+        # diagnosis is worth its probability, scaled down by how far the
+        # student's estimate is from it; confident wrong diagnoses cost
+        # points. A plain loop - there are only a handful of diagnoses
+        score = 0.0
+        max_score = 0.0
+        for name, probability in actual_diagnoses.items():
+            max_score += probability * 100
+            if name in student_diagnoses:
+                score_factor = 1 - min(abs(probability - student_diagnoses[name]), 0.5) * 2
+                score += probability * 100 * score_factor
+                
+        for name, probability in student_diagnoses.items():
+            if name not in actual_diagnoses and probability > 0.1:
+                score -= probability * 50
+                
+        return max(0.0, min(100.0, score / max_score * 100)) if max_score > 0 else 0.0
     
     def _generate_feedback(
         self, 
@@ -95,44 +109,51 @@ class DiagnosticEngine:
         Returns:
             List of feedback items
         """
-        # Placeholder implementation
-        feedback = []
+        # Partition diagnoses once with key-view set operations; each group
+        # keeps the order of the dict it comes from
+        matched = actual_diagnoses.keys() & student_diagnoses.keys()
+        spurious = {
+            diagnosis for diagnosis in student_diagnoses.keys() - actual_diagnoses.keys()
+            if student_diagnoses[diagnosis] > 0.1
+        }
+        
+        feedback = [
+            {
+                "diagnosis": diagnosis,
+                "correct": True,
+                "actual_probability": probability,
+                "student_probability": student_diagnoses[diagnosis],
+                "accuracy": 1 - min(abs(probability - student_diagnoses[diagnosis]), 0.5) * 2,
+                "comment": "Good job identifying this diagnosis."
+            }
+            for diagnosis, probability in actual_diagnoses.items() if diagnosis in matched
+        ]
+        
+        feedback.extend(
+            {
+                "diagnosis": diagnosis,
+                "correct": False,
+                "actual_probability": probability,
+                "student_probability": 0,
+                "accuracy": 0,
+                "comment": "You missed this diagnosis."
+            }
+            for diagnosis, probability in actual_diagnoses.items() if diagnosis not in matched
+        )
+        
+        # Incorrect diagnoses the student gave real weight to
+        feedback.extend(
+            {
+                "diagnosis": diagnosis,
+                "correct": False,
+                "actual_probability": 0,
+                "student_probability": probability,
+                "accuracy": 0,
+                "comment": "This diagnosis is not correct for this patient."
+            }
+            for diagnosis, probability in student_diagnoses.items() if diagnosis in spurious
+        )
         
-        for diagnosis, probability in actual_diagnoses.items():
-            if diagnosis in student_diagnoses:
-                student_prob = student_diagnoses[diagnosis]
-                accuracy = 1 - min(abs(probability - student_prob), 0.5) * 2
-                
-                feedback.append({
-                    "diagnosis": diagnosis,
-                    "correct": True,
-                    "actual_probability": probability,
-                    "student_probability": student_prob,
-                    "accuracy": accuracy,
-                    "comment": "Good job identifying this diagnosis."
-                })
-            else:
-                feedback.append({
-                    "diagnosis": diagnosis,
-                    "correct": False,
-                    "actual_probability": probability,
-                    "student_probability": 0,
-                    "accuracy": 0,
-                    "comment": "You missed this diagnosis."
-                })
-                
-        # Check for incorrect diagnoses
-        for diagnosis, probability in student_diagnoses.items():
-            if diagnosis not in actual_diagnoses and probability > 0.1:
-                feedback.append({
-                    "diagnosis": diagnosis,
-                    "correct": False,
-                    "actual_probability": 0,
-                    "student_probability": probability,
-                    "accuracy": 0,
-                    "comment": "This diagnosis is not correct for this patient."
-                })
-                
         return feedback
     
     def _analyze_information_usage(self, revealed_info: Dict) -> Dict:
@@ -4,8 +4,11 @@ Analyzes student performance and provides educational insights.
 """
 
 import logging
+import operator
 from typing import Dict, List, Optional, Union, Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 class FeedbackAnalyzer:
@@ -142,7 +145,11 @@ class FeedbackAnalyzer:
         # Placeholder implementation
         recommendations = []
         
-        lowest_metric = min(metrics.items(), key=lambda x: x[1] if x[0] != "overall_score" else 100)
+        lowest_metric = min(
+            ((metric, value) for metric, value in metrics.items() if metric != "overall_score"),
+            key=operator.itemgetter(1),
+            default=(None, None)
+        )
         
         if lowest_metric[0] == "differential_diagnosis":
             recommendations.append({
@@ -199,18 +206,17 @@ class FeedbackAnalyzer:
         """
         # Placeholder implementation
         
-        # Calculate average metrics
-        avg_metrics = {metric: 0 for metric in self.performance_metrics}
-        avg_metrics["overall_score"] = 0
-        
-        for performance in performance_history:
-            metrics = performance.get("metrics", {})
-            for metric in avg_metrics:
-                avg_metrics[metric] += metrics.get(metric, 0)
-                
-        # Calculate averages
-        for metric in avg_metrics:
-            avg_metrics[metric] /= max(len(performance_history), 1)
+        # Calculate average metrics: one (cases, metrics) array, one reduction
+        metric_names = self.performance_metrics + ["overall_score"]
+        values = np.array(
+            [
+                [metrics.get(metric, 0) for metric in metric_names]
+                for metrics in (performance.get("metrics", {}) for performance in performance_history)
+            ],
+            dtype=np.float64
+        ).reshape(len(performance_history), len(metric_names))
+        means = values.mean(axis=0) if len(values) else np.zeros(len(metric_names))
+        avg_metrics = dict(zip(metric_names, means.tolist()))
             
         # Identify trends
         trends = self._identify_trends(performance_history)
@@ -6,7 +6,7 @@ Defines the structure and behavior of virtual patients for medical simulations.
 import json
 import random
 import time
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 import logging
 
@@ -15,6 +15,8 @@ logger = logging.getLogger(__name__)
 class VitalSign:
     """Class representing a vital sign with normal range and current value."""
     
+    __slots__ = ("name", "current_value", "unit", "min_normal", "max_normal", "critical_low", "critical_high", "trend", "history")
+    
     def __init__(
         self,
         name: str,
@@ -61,8 +63,9 @@ class VitalSign:
             timestamp = time.time()
             
         # Update current value
-        old_value = self.current_value
+        old_value = self.primary_value
         self.current_value = new_value
+        new_value = self.primary_value
         
         # Update trend
         if new_value > old_value:
@@ -73,29 +76,43 @@ class VitalSign:
             self.trend = "stable"
             
         # Add to history
-        self.history.append((timestamp, new_value))
+        self.history.append((timestamp, self.current_value))
         
         # Keep history to a reasonable size
         if len(self.history) > 100:
             self.history = self.history[-100:]
     
+    @property
+    def primary_value(self) -> float:
+        """
+        Value the ranges apply to.
+        
+        Paired readings such as blood pressure ("120/80") are stored as
+        strings; their ranges refer to the first (systolic) component.
+        """
+        if isinstance(self.current_value, str):
+            return float(self.current_value.split("/", 1)[0])
+        return self.current_value
+    
     def is_normal(self) -> bool:
         """Check if the vital sign is within normal range."""
-        return self.min_normal <= self.current_value <= self.max_normal
+        return self.min_normal <= self.primary_value <= self.max_normal
     
     def is_critical(self) -> bool:
         """Check if the vital sign is at critical levels."""
-        return self.current_value <= self.critical_low or self.current_value >= self.critical_high
+        value = self.primary_value
+        return value <= self.critical_low or value >= self.critical_high
     
     def get_status(self) -> str:
         """Get the status of the vital sign."""
+        value = self.primary_value
         if self.is_critical():
-            if self.current_value <= self.critical_low:
+            if value <= self.critical_low:
                 return "critical_low"
             else:
                 return "critical_high"
         elif not self.is_normal():
-            if self.current_value < self.min_normal:
+            if value < self.min_normal:
                 return "below_normal"
             else:
                 return "above_normal"
@@ -118,6 +135,8 @@ class VitalSign:
 class Symptom:
     """Class representing a symptom with severity and timeline."""
     
+    __slots__ = ("name", "description", "severity", "onset_time", "duration", "characteristics", "associated_factors", "history")
+    
     def __init__(
         self,
         name: str,
@@ -190,6 +209,8 @@ class Symptom:
 class MedicalHistory:
     """Class representing a patient's medical history."""
     
+    __slots__ = ("conditions", "surgeries", "medications", "allergies", "family_history", "social_history")
+    
     def __init__(
         self,
         conditions: Optional[List[Dict]] = None,
@@ -248,6 +269,8 @@ class MedicalHistory:
 class PhysicalExam:
     """Class representing a physical examination."""
     
+    __slots__ = ("general_appearance", "systems")
+    
     def __init__(
         self,
         general_appearance: Dict,
@@ -293,6 +316,8 @@ class PhysicalExam:
 class LabResult:
     """Class representing a laboratory result."""
     
+    __slots__ = ("name", "value", "unit", "reference_range", "timestamp", "critical", "notes")
+    
     def __init__(
         self,
         name: str,
@@ -346,6 +371,8 @@ class LabResult:
 class ImagingStudy:
     """Class representing an imaging study."""
     
+    __slots__ = ("name", "modality", "findings", "impression", "timestamp", "images", "notes")
+    
     def __init__(
         self,
         name: str,
@@ -396,6 +423,18 @@ class ImagingStudy:
 class VirtualPatient:
     """Class representing a virtual patient for medical simulations."""
     
+    # Instances are created in bulk by CaseGenerator; slots drop the
+    # per-instance __dict__. The *_pool slots hold results that are revealed
+    # during the case and may be unset; _pending holds factories that build
+    # them on first access.
+    __slots__ = (
+        "patient_id", "name", "age", "gender", "chief_complaint",
+        "history_of_present_illness", "vital_signs", "symptoms",
+        "medical_history", "physical_exam", "lab_results", "imaging_studies",
+        "diagnoses", "scenario_difficulty", "expert_reasoning", "revealed_info",
+        "_lab_results_pool", "_imaging_studies_pool", "_pending"
+    )
+    
     def __init__(
         self,
         patient_id: str,
@@ -460,6 +499,58 @@ class VirtualPatient:
             "imaging_studies": {}
         }
     
+    def defer_potential_results(
+        self,
+        lab_results: Callable[[], Dict[str, LabResult]],
+        imaging_studies: Callable[[], List[ImagingStudy]]
+    ):
+        """
+        Generate revealable lab results and imaging studies on first access.
+        
+        Most cases never order every study, so the work is skipped until the
+        potential results are actually needed.
+        
+        Args:
+            lab_results: Factory for the potential lab results
+            imaging_studies: Factory for the potential imaging studies
+        """
+        self._pending = {
+            "_lab_results_pool": lab_results,
+            "_imaging_studies_pool": imaging_studies
+        }
+    
+    def _pooled(self, slot: str):
+        """Value of a *_pool slot, built from its pending factory if needed."""
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            factory = getattr(self, "_pending", {}).pop(slot, None)
+            if factory is None:
+                raise
+            value = factory()
+            setattr(self, slot, value)
+            return value
+    
+    @property
+    def _potential_lab_results(self) -> Dict[str, LabResult]:
+        """Lab results that can be revealed during the case."""
+        return self._pooled("_lab_results_pool")
+    
+    @_potential_lab_results.setter
+    def _potential_lab_results(self, value: Dict[str, LabResult]):
+        getattr(self, "_pending", {}).pop("_lab_results_pool", None)
+        self._lab_results_pool = value
+    
+    @property
+    def _potential_imaging_studies(self) -> List[ImagingStudy]:
+        """Imaging studies that can be revealed during the case."""
+        return self._pooled("_imaging_studies_pool")
+    
+    @_potential_imaging_studies.setter
+    def _potential_imaging_studies(self, value: List[ImagingStudy]):
+        getattr(self, "_pending", {}).pop("_imaging_studies_pool", None)
+        self._imaging_studies_pool = value
+    
     def reveal_info(self, category: str, item_name: Optional[str] = None) -> Dict:
         """
         Reveal information to the student.
@@ -0,0 +1,56 @@
+"""
+Async helpers for DocMentor.
+Run coroutines from synchronous code on one persistent background loop.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the shared background event loop, starting its thread on first use.
+
+    Returns:
+        Event loop running forever in a daemon thread
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever,
+                name="docmentor-async",
+                daemon=True
+            )
+            _thread.start()
+        return _loop
+
+
+def run_sync(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the background loop and block until it finishes.
+
+    Safe to call from any thread, including one that is already running
+    its own event loop.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Optional timeout in seconds
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the background loop itself
+    """
+    loop = get_background_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("run_sync() cannot be called from the background loop")
+
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
@@ -4,13 +4,14 @@ Handles caching of processed documents and embeddings.
 """
 
 import os
-import json
 import hashlib
 import pickle
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 from datetime import datetime, timedelta
 
+from . import json_utils
+
 class CacheManager:
     def __init__(self, cache_dir: str = ".cache", max_age_days: int = 7):
         """
@@ -51,18 +52,17 @@ class CacheManager:
         
     def _save_index(self, index: Dict) -> None:
         """Save metadata index to disk."""
-        with open(self.index_path, 'w') as f:
-            json.dump(index, f)
+        json_utils.dump_file(index, self.index_path)
             
     def _load_index(self) -> Dict:
         """Load metadata index from disk."""
-        with open(self.index_path, 'r') as f:
-            return json.load(f)
+        return json_utils.load_file(self.index_path)
             
-    def _is_expired(self, timestamp: str) -> bool:
-        """Check if cache entry has expired."""
+    def _is_expired(self, timestamp: str, ttl: Optional[float] = None) -> bool:
+        """Check if cache entry has expired (after ttl seconds or max_age)."""
         entry_time = datetime.fromisoformat(timestamp)
-        return datetime.now() - entry_time > self.max_age
+        max_age = self.max_age if ttl is None else timedelta(seconds=ttl)
+        return datetime.now() - entry_time > max_age
         
     def get(self, key: str, category: str = "documents") -> Optional[Any]:
         """
@@ -80,7 +80,7 @@ class CacheManager:
             return None
             
         entry = index[key]
-        if self._is_expired(entry["timestamp"]):
+        if self._is_expired(entry["timestamp"], entry.get("ttl")):
             self.invalidate(key)
             return None
             
@@ -92,7 +92,14 @@ class CacheManager:
         with open(cache_path, 'rb') as f:
             return pickle.load(f)
             
-    def put(self, key: str, value: Any, category: str = "documents", metadata: Dict = None) -> None:
+    def put(
+        self,
+        key: str,
+        value: Any,
+        category: str = "documents",
+        metadata: Dict = None,
+        ttl: Optional[float] = None
+    ) -> None:
         """
         Store item in cache.
         
@@ -101,6 +108,7 @@ class CacheManager:
             value: Item to cache
             category: Cache category (documents/embeddings)
             metadata: Additional metadata to store
+            ttl: Lifetime in seconds (defaults to max_age)
         """
         # Save value
         cache_path = self.cache_dir / category / f"{key}.pkl"
@@ -112,7 +120,8 @@ class CacheManager:
         index[key] = {
             "timestamp": datetime.now().isoformat(),
             "category": category,
-            "metadata": metadata or {}
+            "metadata": metadata or {},
+            "ttl": ttl
         }
         self._save_index(index)
         
@@ -0,0 +1,121 @@
+"""
+File utilities for DocMentor.
+Fast copying and content hashing of documents in storage.
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import ctypes
+import ctypes.util
+import logging
+from pathlib import Path
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+# ioctl request for a reflink clone on Linux (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+_libc = None
+if sys.platform == "darwin":
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        _libc.clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        _libc = None
+
+
+def _clonefile(src: str, dst: str) -> bool:
+    """APFS copy-on-write clone (macOS)."""
+    if _libc is None:
+        return False
+    return _libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """Copy-on-write clone via FICLONE, falling back to copy_file_range (Linux)."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            pass
+
+        if not hasattr(os, "copy_file_range"):
+            return False
+
+        # In-kernel copy; filesystems that support it share extents here too
+        try:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            return remaining == 0
+        except OSError:
+            return False
+
+
+def fast_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Copy a file, cloning it instead of duplicating data where possible.
+
+    Tries an APFS clone on macOS, a reflink or copy_file_range on Linux,
+    and falls back to shutil.copy2. File metadata is preserved like copy2.
+
+    Args:
+        src: Source file
+        dst: Destination file (must not be a directory)
+    """
+    src, dst = str(src), str(dst)
+
+    try:
+        if _clonefile(src, dst):
+            return
+        if sys.platform.startswith("linux") and _reflink(src, dst):
+            shutil.copystat(src, dst)
+            return
+    except OSError as e:
+        logger.debug(f"Fast copy failed for {src}: {str(e)}")
+
+    shutil.copy2(src, dst)
+
+
+def link_or_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Hardlink a file into place, copying only across filesystems.
+
+    Args:
+        src: Source file
+        dst: Destination file (must not exist)
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        fast_copy(src, dst)
+
+
+def file_digest(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    BLAKE2b content hash of a file, read in chunks.
+
+    Args:
+        path: File to hash
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest (128-bit)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,70 @@
+"""
+JSON helpers for DocMentor.
+Use orjson when it is installed and fall back to the standard library.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON.
+
+    Args:
+        obj: JSON-serializable object
+        indent: Pretty-print with two-space indentation
+        default: Called with objects the encoder cannot serialize; returns
+            a serializable replacement or raises TypeError
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=default).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: Encoded or decoded JSON document
+
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_file(
+    obj: Any,
+    path: Union[str, Path],
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None
+) -> None:
+    """Write obj as JSON to path (see dumps for the arguments)."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(dumps(obj, indent=indent, default=default))
+        return
+
+    # json.dump writes the document chunk by chunk as it is encoded, so
+    # large documents are never held in memory as one string
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2 if indent else None, default=default)
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """Read a JSON document from path."""
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -26,7 +26,8 @@ class SyncManager:
         api_key: Optional[str] = None,
         sync_interval: int = 3600,  # 1 hour by default
         retry_limit: int = 3,
-        retry_delay: int = 30  # 30 seconds
+        retry_delay: int = 30,  # 30 seconds
+        session: Optional[aiohttp.ClientSession] = None
     ):
         """
         Initialize sync manager.
@@ -38,6 +39,8 @@ class SyncManager:
             sync_interval: Default interval between syncs in seconds
             retry_limit: Number of retry attempts for failed operations
             retry_delay: Delay between retries in seconds
+            session: Optional HTTP session owned by the caller; it is used
+                for every request and left open by close()
         """
         self.local_path = Path(local_path)
         self.cloud_endpoint = cloud_endpoint
@@ -55,6 +58,50 @@ class SyncManager:
         
         # Initialize sync info
         self.sync_info = self._load_sync_info()
+        
+        # HTTP session shared by all requests (created on first use
+        # unless one was injected)
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        # Event loop the owned session was created on
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared keep-alive HTTP session, creating it if needed.
+        
+        A session is bound to the event loop it was created on. Callers
+        that run each request in its own asyncio.run() get a new session
+        per loop; the previous loop is already closed, so its session is
+        dropped rather than awaited.
+        """
+        if not self._owns_session:
+            if self._session.closed:
+                raise RuntimeError("Injected HTTP session is closed")
+            return self._session
+        
+        loop = asyncio.get_running_loop()
+        if self._session is not None and (self._session.closed or self._session_loop is not loop):
+            self._session = None
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=60)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session, unless it was injected."""
+        if not self._owns_session:
+            return
+        if (
+            self._session is not None
+            and not self._session.closed
+            and self._session_loop is asyncio.get_running_loop()
+        ):
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
     
     def _load_sync_info(self) -> Dict:
         """Load sync info from file or create default."""
@@ -159,28 +206,28 @@ class SyncManager:
         device_id = self.sync_info["device_id"]
         last_sync_time = self.sync_info["last_sync_time"]
         
-        async with aiohttp.ClientSession() as session:
-            headers = self._get_auth_headers()
-            
-            for attempt in range(self.retry_limit):
-                try:
-                    async with session.get(
-                        f"{self.cloud_endpoint}/api/sync/metadata",
-                        headers=headers,
-                        params={"device_id": device_id, "last_sync_time": last_sync_time}
-                    ) as response:
-                        if response.status == 200:
-                            return await response.json()
-                        else:
-                            error_text = await response.text()
-                            raise Exception(f"Error getting sync metadata: {response.status} - {error_text}")
-                
-                except Exception as e:
-                    if attempt < self.retry_limit - 1:
-                        logger.warning(f"Attempt {attempt + 1} failed: {str(e)}. Retrying in {self.retry_delay} seconds")
-                        await asyncio.sleep(self.retry_delay)
+        session = self._get_session()
+        headers = self._get_auth_headers()
+        
+        for attempt in range(self.retry_limit):
+            try:
+                async with session.get(
+                    f"{self.cloud_endpoint}/api/sync/metadata",
+                    headers=headers,
+                    params={"device_id": device_id, "last_sync_time": last_sync_time}
+                ) as response:
+                    if response.status == 200:
+                        return await response.json()
                     else:
-                        raise
+                        error_text = await response.text()
+                        raise Exception(f"Error getting sync metadata: {response.status} - {error_text}")
+            
+            except Exception as e:
+                if attempt < self.retry_limit - 1:
+                    logger.warning(f"Attempt {attempt + 1} failed: {str(e)}. Retrying in {self.retry_delay} seconds")
+                    await asyncio.sleep(self.retry_delay)
+                else:
+                    raise
         
         raise Exception("Failed to get sync metadata after multiple attempts")
     
@@ -199,51 +246,51 @@ class SyncManager:
         
         logger.info(f"Processing {len(pending_uploads)} pending uploads")
         
-        async with aiohttp.ClientSession() as session:
-            headers = self._get_auth_headers()
+        session = self._get_session()
+        headers = self._get_auth_headers()
+        
+        for upload_info in pending_uploads[:]:  # Work on a copy of the list
+            file_path = Path(upload_info["file_path"])
             
-            for upload_info in pending_uploads[:]:  # Work on a copy of the list
-                file_path = Path(upload_info["file_path"])
+            if not file_path.exists():
+                logger.warning(f"Upload file not found: {file_path}")
+                pending_uploads.remove(upload_info)
+                continue
+            
+            try:
+                # Prepare form data
+                form = aiohttp.FormData()
+                form.add_field('file', 
+                               open(file_path, 'rb'),
+                               filename=file_path.name,
+                               content_type='application/octet-stream')
                 
-                if not file_path.exists():
-                    logger.warning(f"Upload file not found: {file_path}")
-                    pending_uploads.remove(upload_info)
-                    continue
+                form.add_field('metadata', json.dumps(upload_info["metadata"]))
+                form.add_field('device_id', self.sync_info["device_id"])
                 
-                try:
-                    # Prepare form data
-                    form = aiohttp.FormData()
-                    form.add_field('file', 
-                                   open(file_path, 'rb'),
-                                   filename=file_path.name,
-                                   content_type='application/octet-stream')
-                    
-                    form.add_field('metadata', json.dumps(upload_info["metadata"]))
-                    form.add_field('device_id', self.sync_info["device_id"])
-                    
-                    # Upload file
-                    async with session.post(
-                        f"{self.cloud_endpoint}/api/sync/upload",
-                        headers=headers,
-                        data=form
-                    ) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            successful_uploads.append({
-                                "file_path": str(file_path),
-                                "cloud_id": result.get("cloud_id", ""),
-                                "timestamp": time.time()
-                            })
-                            
-                            # Remove from pending uploads
-                            pending_uploads.remove(upload_info)
-                            logger.info(f"Successfully uploaded {file_path.name}")
-                        else:
-                            error_text = await response.text()
-                            logger.error(f"Upload failed: {response.status} - {error_text}")
-                
-                except Exception as e:
-                    logger.error(f"Error uploading {file_path.name}: {str(e)}")
+                # Upload file
+                async with session.post(
+                    f"{self.cloud_endpoint}/api/sync/upload",
+                    headers=headers,
+                    data=form
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        successful_uploads.append({
+                            "file_path": str(file_path),
+                            "cloud_id": result.get("cloud_id", ""),
+                            "timestamp": time.time()
+                        })
+                        
+                        # Remove from pending uploads
+                        pending_uploads.remove(upload_info)
+                        logger.info(f"Successfully uploaded {file_path.name}")
+                    else:
+                        error_text = await response.text()
+                        logger.error(f"Upload failed: {response.status} - {error_text}")
+            
+            except Exception as e:
+                logger.error(f"Error uploading {file_path.name}: {str(e)}")
         
         # Update sync info
         self.sync_info["pending_uploads"] = pending_uploads
@@ -269,44 +316,44 @@ class SyncManager:
         
         logger.info(f"Processing {len(available_downloads)} available downloads")
         
-        async with aiohttp.ClientSession() as session:
-            headers = self._get_auth_headers()
+        session = self._get_session()
+        headers = self._get_auth_headers()
+        
+        for download_info in available_downloads:
+            cloud_id = download_info["cloud_id"]
+            filename = download_info["filename"]
+            target_path = self.local_path / "documents" / "cloud" / filename
             
-            for download_info in available_downloads:
-                cloud_id = download_info["cloud_id"]
-                filename = download_info["filename"]
-                target_path = self.local_path / "documents" / "cloud" / filename
-                
-                # Create directory if it doesn't exist
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                try:
-                    async with session.get(
-                        f"{self.cloud_endpoint}/api/sync/download/{cloud_id}",
-                        headers=headers
-                    ) as response:
-                        if response.status == 200:
-                            # Save file
-                            with open(target_path, 'wb') as f:
-                                f.write(await response.read())
-                            
-                            successful_downloads.append({
-                                "cloud_id": cloud_id,
-                                "file_path": str(target_path),
-                                "metadata": download_info.get("metadata", {}),
-                                "timestamp": time.time()
-                            })
-                            
-                            logger.info(f"Successfully downloaded {filename}")
-                            
-                            # Acknowledge download
-                            await self._acknowledge_download(cloud_id)
-                        else:
-                            error_text = await response.text()
-                            logger.error(f"Download failed: {response.status} - {error_text}")
-                
-                except Exception as e:
-                    logger.error(f"Error downloading {filename}: {str(e)}")
+            # Create directory if it doesn't exist
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            try:
+                async with session.get(
+                    f"{self.cloud_endpoint}/api/sync/download/{cloud_id}",
+                    headers=headers
+                ) as response:
+                    if response.status == 200:
+                        # Save file
+                        with open(target_path, 'wb') as f:
+                            f.write(await response.read())
+                        
+                        successful_downloads.append({
+                            "cloud_id": cloud_id,
+                            "file_path": str(target_path),
+                            "metadata": download_info.get("metadata", {}),
+                            "timestamp": time.time()
+                        })
+                        
+                        logger.info(f"Successfully downloaded {filename}")
+                        
+                        # Acknowledge download
+                        await self._acknowledge_download(cloud_id)
+                    else:
+                        error_text = await response.text()
+                        logger.error(f"Download failed: {response.status} - {error_text}")
+            
+            except Exception as e:
+                logger.error(f"Error downloading {filename}: {str(e)}")
         
         # Update sync info with successful downloads
         self.sync_info["synced_documents"].extend(successful_downloads)
@@ -324,23 +371,23 @@ class SyncManager:
         Returns:
             Success status
         """
-        async with aiohttp.ClientSession() as session:
-            headers = self._get_auth_headers()
-            
-            try:
-                async with session.post(
-                    f"{self.cloud_endpoint}/api/sync/acknowledge",
-                    headers=headers,
-                    json={
-                        "device_id": self.sync_info["device_id"],
-                        "cloud_id": cloud_id,
-                        "status": "downloaded"
-                    }
-                ) as response:
-                    return response.status == 200
-            except Exception as e:
-                logger.error(f"Error acknowledging download: {str(e)}")
-                return False
+        session = self._get_session()
+        headers = self._get_auth_headers()
+        
+        try:
+            async with session.post(
+                f"{self.cloud_endpoint}/api/sync/acknowledge",
+                headers=headers,
+                json={
+                    "device_id": self.sync_info["device_id"],
+                    "cloud_id": cloud_id,
+                    "status": "downloaded"
+                }
+            ) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.error(f"Error acknowledging download: {str(e)}")
+            return False
     
     async def _check_conflicts(self, sync_metadata: Dict) -> List[Dict]:
         """
@@ -508,49 +555,49 @@ class SyncManager:
                 
             elif resolution == "cloud":
                 # Download cloud version
-                async with aiohttp.ClientSession() as session:
-                    headers = self._get_auth_headers()
-                    
-                    async with session.get(
-                        f"{self.cloud_endpoint}/api/sync/download/{cloud_id}",
-                        headers=headers
-                    ) as response:
-                        if response.status == 200:
-                            # Create backup of local file
-                            backup_path = self.sync_dir / "backups" / f"{filename}.bak"
-                            backup_path.parent.mkdir(parents=True, exist_ok=True)
-                            shutil.copy2(local_path, backup_path)
+                session = self._get_session()
+                headers = self._get_auth_headers()
+                
+                async with session.get(
+                    f"{self.cloud_endpoint}/api/sync/download/{cloud_id}",
+                    headers=headers
+                ) as response:
+                    if response.status == 200:
+                        # Create backup of local file
+                        backup_path = self.sync_dir / "backups" / f"{filename}.bak"
+                        backup_path.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.copy2(local_path, backup_path)
+                        
+                        # Replace local file
+                        with open(local_path, 'wb') as f:
+                            f.write(await response.read())
                             
-                            # Replace local file
-                            with open(local_path, 'wb') as f:
-                                f.write(await response.read())
-                                
-                            # Acknowledge resolution
-                            await self._acknowledge_resolution(cloud_id, "cloud_preferred")
-                        else:
-                            error_text = await response.text()
-                            raise Exception(f"Download failed: {response.status} - {error_text}")
+                        # Acknowledge resolution
+                        await self._acknowledge_resolution(cloud_id, "cloud_preferred")
+                    else:
+                        error_text = await response.text()
+                        raise Exception(f"Download failed: {response.status} - {error_text}")
             
             elif resolution == "manual":
                 # Download cloud version as separate file
-                async with aiohttp.ClientSession() as session:
-                    headers = self._get_auth_headers()
-                    
-                    async with session.get(
-                        f"{self.cloud_endpoint}/api/sync/download/{cloud_id}",
-                        headers=headers
-                    ) as response:
-                        if response.status == 200:
-                            # Save as separate file
-                            cloud_path = local_path.with_suffix(f".cloud{local_path.suffix}")
-                            with open(cloud_path, 'wb') as f:
-                                f.write(await response.read())
-                                
-                            # Mark conflict for manual resolution
-                            await self._acknowledge_resolution(cloud_id, "manual_resolution")
-                        else:
-                            error_text = await response.text()
-                            raise Exception(f"Download failed: {response.status} - {error_text}")
+                session = self._get_session()
+                headers = self._get_auth_headers()
+                
+                async with session.get(
+                    f"{self.cloud_endpoint}/api/sync/download/{cloud_id}",
+                    headers=headers
+                ) as response:
+                    if response.status == 200:
+                        # Save as separate file
+                        cloud_path = local_path.with_suffix(f".cloud{local_path.suffix}")
+                        with open(cloud_path, 'wb') as f:
+                            f.write(await response.read())
+                            
+                        # Mark conflict for manual resolution
+                        await self._acknowledge_resolution(cloud_id, "manual_resolution")
+                    else:
+                        error_text = await response.text()
+                        raise Exception(f"Download failed: {response.status} - {error_text}")
             else:
                 return {"status": "error", "message": f"Invalid resolution strategy: {resolution}"}
             
@@ -580,23 +627,23 @@ class SyncManager:
         Returns:
             Success status
         """
-        async with aiohttp.ClientSession() as session:
-            headers = self._get_auth_headers()
-            
-            try:
-                async with session.post(
-                    f"{self.cloud_endpoint}/api/sync/resolve",
-                    headers=headers,
-                    json={
-                        "device_id": self.sync_info["device_id"],
-                        "cloud_id": cloud_id,
-                        "resolution": resolution
-                    }
-                ) as response:
-                    return response.status == 200
-            except Exception as e:
-                logger.error(f"Error acknowledging resolution: {str(e)}")
-                return False
+        session = self._get_session()
+        headers = self._get_auth_headers()
+        
+        try:
+            async with session.post(
+                f"{self.cloud_endpoint}/api/sync/resolve",
+                headers=headers,
+                json={
+                    "device_id": self.sync_info["device_id"],
+                    "cloud_id": cloud_id,
+                    "resolution": resolution
+                }
+            ) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.error(f"Error acknowledging resolution: {str(e)}")
+            return False
     
     def get_sync_status(self) -> Dict:
         """
@@ -1,5 +1,5 @@
 """Vector store initialization."""
 
-from .faiss_store import FAISSStore
+from .faiss_store import FAISSStore, chunk_digest
 
-__all__ = ['FAISSStore']
\ No newline at end of file
+__all__ = ['FAISSStore', 'chunk_digest']
\ No newline at end of file
@@ -5,15 +5,57 @@ Handles vector embeddings storage and similarity search.
 
 import faiss
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Set, Tuple, Union
 import logging
 from pathlib import Path
 import pickle
+import hashlib
 from sentence_transformers import SentenceTransformer
 import os
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Let FAISS spread batched queries across all cores
+faiss.omp_set_num_threads(os.cpu_count() or 1)
+
+
+def _quantize_dynamic(model):
+    """Swap the model's linear layers for int8 kernels; FP32 if unsupported."""
+    try:
+        import torch
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    except Exception as e:
+        logger.warning(f"Int8 quantization unavailable, using FP32 embedder: {str(e)}")
+        return model
+
+def chunk_digest(text: str) -> bytes:
+    """
+    128-bit content hash of a text chunk.
+    
+    Digests are persisted with the store, so the algorithm must not depend
+    on which optional packages are installed.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+def _intern_metadata(metadata: List[Dict]) -> List[Dict]:
+    """
+    Share one dict between consecutive equal metadata entries.
+    
+    Chunks of a document carry identical metadata, so this keeps a single
+    object per document instead of one copy per chunk. Stored metadata is
+    therefore shared and must be treated as read-only.
+    """
+    interned = []
+    previous = None
+    for meta in metadata:
+        if meta is not previous and meta == previous:
+            meta = previous
+        interned.append(meta)
+        previous = meta
+    return interned
+    
+
 class FAISSStore:
     """Manages vector embeddings using FAISS."""
     
@@ -21,7 +63,8 @@ class FAISSStore:
         self,
         model_name: str = "distilbert-base-multilingual-cased",
         dimension: int = 768,
-        index_type: str = "L2",
+        index_type: str = "IP",
+        quantize: bool = False,
     ):
         """
         Initialize FAISS store.
@@ -29,10 +72,16 @@ class FAISSStore:
         Args:
             model_name: Name of the sentence-transformer model
             dimension: Embedding dimension
-            index_type: FAISS index type ("L2" or "IP" - inner product)
+            index_type: FAISS index type ("L2" or "IP" - inner product).
+                With "IP" embeddings are L2-normalized, so scores are
+                cosine similarities (higher is better).
+            quantize: Run the embedder with int8 dynamic quantization of its
+                linear layers (CPU only; keep False for FP32 evaluation)
         """
         self.dimension = dimension
         self.model = SentenceTransformer(model_name)
+        if quantize:
+            self.model = _quantize_dynamic(self.model)
         
         # Create FAISS index
         if index_type == "L2":
@@ -42,36 +91,76 @@ class FAISSStore:
         else:
             raise ValueError(f"Unsupported index type: {index_type}")
             
+        self.normalize = index_type == "IP"
+            
         # Storage for metadata
         self.texts: List[str] = []
         self.metadata: List[Dict] = []
         
+        # Content hash of every stored chunk, used to skip re-ingested text
+        self.digests: List[bytes] = []
+        self._digest_set: Set[bytes] = set()
+        
+        # Bumped whenever entries are added or removed, so callers can key
+        # caches of search results on it
+        self.generation = 0
+        
+        # Guards the index and the parallel lists, so background ingestion
+        # can run while other threads search
+        self._lock = threading.RLock()
+        
     def add_texts(
         self,
         texts: List[str],
-        metadata: Optional[List[Dict]] = None,
-        batch_size: int = 32
+        metadata: Optional[Union[List[Dict], Dict]] = None,
+        batch_size: int = 32,
+        skip_duplicates: bool = False
     ) -> List[int]:
         """
         Add texts and their embeddings to the store.
         
         Args:
             texts: List of text chunks to add
-            metadata: Optional metadata for each text chunk
+            metadata: Optional metadata for each text chunk, or a single
+                dict shared by all chunks (stored once, not copied)
             batch_size: Batch size for embedding generation
+            skip_duplicates: Drop chunks whose content is already stored
+                (or repeated within texts), so re-ingesting a document
+                adds no vectors
             
         Returns:
-            List of indices for added texts
+            List of indices for added texts, in input order (duplicates
+            skipped with skip_duplicates have none)
         """
         if not texts:
             return []
             
         if metadata is None:
             metadata = [{} for _ in texts]
+        elif isinstance(metadata, dict):
+            metadata = [metadata] * len(texts)
             
         if len(texts) != len(metadata):
             raise ValueError("Number of texts and metadata entries must match")
             
+        digests = [chunk_digest(text) for text in texts]
+        if skip_duplicates:
+            # Repeats within this call are tracked separately, so the
+            # store-wide set is never copied
+            batch_seen = set()
+            keep = []
+            for i, digest in enumerate(digests):
+                if digest not in self._digest_set and digest not in batch_seen:
+                    batch_seen.add(digest)
+                    keep.append(i)
+            if len(keep) < len(texts):
+                logger.debug(f"Skipping {len(texts) - len(keep)} duplicate chunks")
+                texts = [texts[i] for i in keep]
+                metadata = [metadata[i] for i in keep]
+                digests = [digests[i] for i in keep]
+            if not texts:
+                return []
+            
         # Generate embeddings in batches
         all_embeddings = []
         for i in range(0, len(texts), batch_size):
@@ -79,15 +168,19 @@ class FAISSStore:
             embeddings = self.model.encode(batch_texts)
             all_embeddings.append(embeddings)
             
-        embeddings = np.vstack(all_embeddings)
-        
-        # Add to FAISS index
-        self.index.add(embeddings)
+        embeddings = self._prepare(np.vstack(all_embeddings))
         
-        # Store texts and metadata
-        start_idx = len(self.texts)
-        self.texts.extend(texts)
-        self.metadata.extend(metadata)
+        with self._lock:
+            # Add to FAISS index
+            self.index.add(embeddings)
+            
+            # Store texts and metadata
+            start_idx = len(self.texts)
+            self.texts.extend(texts)
+            self.metadata.extend(_intern_metadata(metadata))
+            self.digests.extend(digests)
+            self._digest_set.update(digests)
+            self.generation += 1
         
         return list(range(start_idx, start_idx + len(texts)))
         
@@ -95,8 +188,11 @@ class FAISSStore:
         self,
         query: str,
         k: int = 4,
-        filter_dict: Optional[Dict] = None
-    ) -> List[Tuple[str, Dict, float]]:
+        filter_dict: Optional[Dict] = None,
+        min_score: Optional[float] = None,
+        with_digests: bool = False,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Tuple]:
         """
         Search for most similar texts.
         
@@ -104,21 +200,129 @@ class FAISSStore:
             query: Query text
             k: Number of results to return
             filter_dict: Optional metadata filters
+            min_score: Optional minimum score. Cosine indexes apply it inside
+                FAISS; L2 indexes from older saves filter their raw scores
+                the way RAGPipeline used to
+            with_digests: Append each chunk's content hash to its tuple
+            query_embedding: The query's embedding from self.model.encode,
+                if the caller already computed it
             
         Returns:
-            List of (text, metadata, score) tuples
+            List of (text, metadata, score) tuples, or
+            (text, metadata, score, digest) with with_digests
         """
         # Generate query embedding
-        query_embedding = self.model.encode([query])[0].reshape(1, -1)
+        if query_embedding is None:
+            query_embedding = self.model.encode([query])[0]
+        query_embedding = self._prepare(np.asarray(query_embedding).reshape(1, -1))
         
         # Search in FAISS
-        scores, indices = self.index.search(query_embedding, k)
+        with self._lock:
+            scores, indices = self._search(query_embedding, k, min_score)
+            return self._collect_results(scores[0], indices[0], filter_dict, min_score, with_digests)
+        
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filter_dict: Optional[Dict] = None,
+        min_score: Optional[float] = None,
+        batch_size: int = 64,
+        with_digests: bool = False
+    ) -> List[List[Tuple]]:
+        """
+        Search for several queries at once.
+        
+        All queries are embedded in one encoder call and looked up with a
+        single FAISS search, which FAISS parallelizes across queries.
+        
+        Args:
+            queries: Query texts
+            k: Number of results to return per query
+            filter_dict: Optional metadata filters
+            min_score: Optional minimum score (see similarity_search)
+            batch_size: Batch size for query embedding
+            with_digests: Append each chunk's content hash to its tuple
+            
+        Returns:
+            One list of (text, metadata, score[, digest]) tuples per query
+        """
+        if not queries:
+            return []
+            
+        query_embeddings = self._prepare(
+            np.asarray(self.model.encode(queries, batch_size=batch_size)).reshape(len(queries), -1)
+        )
         
+        with self._lock:
+            scores, indices = self._search(query_embeddings, k, min_score)
+            return [
+                self._collect_results(row_scores, row_indices, filter_dict, min_score, with_digests)
+                for row_scores, row_indices in zip(scores, indices)
+            ]
+        
+    def _search(
+        self,
+        embeddings: np.ndarray,
+        k: int,
+        min_score: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k search, with the similarity threshold applied inside FAISS.
+        
+        For cosine indexes with a threshold, range_search only returns
+        hits above min_score, which are then cut to the best k per query.
+        Output has the same (n, k) layout as index.search, padded with -1.
+        """
+        if min_score is None or not self.normalize:
+            return self.index.search(embeddings, k)
+            
+        try:
+            # range_search keeps scores strictly above the radius
+            radius = float(np.nextafter(np.float32(min_score), np.float32(-np.inf)))
+            lims, range_scores, range_indices = self.index.range_search(embeddings, radius)
+        except RuntimeError:
+            # Index type without range search support
+            return self.index.search(embeddings, k)
+            
+        n = embeddings.shape[0]
+        scores = np.full((n, k), -np.inf, dtype=np.float32)
+        indices = np.full((n, k), -1, dtype=np.int64)
+        for i in range(n):
+            row_scores = range_scores[lims[i]:lims[i + 1]]
+            row_indices = range_indices[lims[i]:lims[i + 1]]
+            top = np.argsort(-row_scores, kind="stable")[:k]
+            scores[i, :len(top)] = row_scores[top]
+            indices[i, :len(top)] = row_indices[top]
+            
+        return scores, indices
+        
+    def _prepare(self, embeddings: np.ndarray) -> np.ndarray:
+        """Convert embeddings to FAISS layout, normalizing them for cosine search."""
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if self.normalize:
+            faiss.normalize_L2(embeddings)
+        return embeddings
+        
+    def _collect_results(
+        self,
+        scores: np.ndarray,
+        indices: np.ndarray,
+        filter_dict: Optional[Dict] = None,
+        min_score: Optional[float] = None,
+        with_digests: bool = False
+    ) -> List[Tuple]:
+        """Turn one row of FAISS output into (text, metadata, score[, digest]) tuples."""
+        # FAISS may return -1 if not enough results; drop those and
+        # low-similarity hits with one vectorized mask
+        keep = indices >= 0
+        if min_score is not None:
+            keep &= scores >= min_score
+        if not keep.all():
+            scores, indices = scores[keep], indices[keep]
+            
         results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx < 0:  # FAISS may return -1 if not enough results
-                continue
-                
+        for score, idx in zip(scores.tolist(), indices.tolist()):
             text = self.texts[idx]
             meta = self.metadata[idx]
             
@@ -127,10 +331,45 @@ class FAISSStore:
                 if not all(meta.get(key) == value for key, value in filter_dict.items()):
                     continue
                     
-            results.append((text, meta, float(score)))
+            if with_digests:
+                results.append((text, meta, score, self.digests[idx]))
+            else:
+                results.append((text, meta, score))
             
         return results
         
+    def retain(self, predicate: Callable[[Dict], bool]) -> int:
+        """
+        Keep only the entries whose metadata satisfies predicate.
+        
+        Vectors are reconstructed from the flat index, so nothing is
+        re-embedded.
+        
+        Args:
+            predicate: Called with each entry's metadata
+            
+        Returns:
+            Number of removed entries
+        """
+        with self._lock:
+            keep = [i for i, meta in enumerate(self.metadata) if predicate(meta)]
+            removed = len(self.texts) - len(keep)
+            if not removed:
+                return 0
+                
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)[keep]
+            self.index.reset()
+            if len(keep):
+                self.index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+                
+            self.texts = [self.texts[i] for i in keep]
+            self.metadata = [self.metadata[i] for i in keep]
+            self.digests = [self.digests[i] for i in keep]
+            self._digest_set = set(self.digests)
+            self.generation += 1
+        
+        return removed
+        
     def save_local(self, save_dir: str):
         """
         Save the vector store to disk.
@@ -141,21 +380,32 @@ class FAISSStore:
         save_dir = Path(save_dir)
         save_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save FAISS index
-        faiss.write_index(self.index, str(save_dir / "index.faiss"))
+        # Write to temporary files first and swap them in, so a crash
+        # mid-save never leaves a truncated index behind
+        index_path = save_dir / "index.faiss"
+        store_path = save_dir / "store.pkl"
         
-        # Save texts and metadata
-        with open(save_dir / "store.pkl", "wb") as f:
-            pickle.dump({
-                "texts": self.texts,
-                "metadata": self.metadata
-            }, f)
+        with self._lock:
+            # Save FAISS index
+            faiss.write_index(self.index, str(index_path) + ".tmp")
+            
+            # Save texts and metadata
+            with open(str(store_path) + ".tmp", "wb") as f:
+                pickle.dump({
+                    "texts": self.texts,
+                    "metadata": self.metadata,
+                    "digests": self.digests
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+        os.replace(str(index_path) + ".tmp", index_path)
+        os.replace(str(store_path) + ".tmp", store_path)
             
     @classmethod
     def load_local(
         cls,
         load_dir: str,
-        model_name: str = "distilbert-base-multilingual-cased"
+        model_name: str = "distilbert-base-multilingual-cased",
+        quantize: bool = False
     ) -> "FAISSStore":
         """
         Load vector store from disk.
@@ -163,6 +413,7 @@ class FAISSStore:
         Args:
             load_dir: Directory containing saved store
             model_name: Name of the sentence-transformer model
+            quantize: Load the embedder with int8 dynamic quantization
             
         Returns:
             Loaded FAISSStore instance
@@ -170,15 +421,20 @@ class FAISSStore:
         load_dir = Path(load_dir)
         
         # Create instance
-        store = cls(model_name=model_name)
+        store = cls(model_name=model_name, quantize=quantize)
         
         # Load FAISS index
         store.index = faiss.read_index(str(load_dir / "index.faiss"))
+        # Stores saved before the switch to cosine search are plain L2
+        store.normalize = store.index.metric_type == faiss.METRIC_INNER_PRODUCT
         
         # Load texts and metadata
         with open(load_dir / "store.pkl", "rb") as f:
             data = pickle.load(f)
             store.texts = data["texts"]
-            store.metadata = data["metadata"]
+            store.metadata = _intern_metadata(data["metadata"])
+            # Stores saved before content hashing get their digests computed once
+            store.digests = data.get("digests") or [chunk_digest(text) for text in store.texts]
+            store._digest_set = set(store.digests)
             
         return store
\ No newline at end of file
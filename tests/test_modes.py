@@ -112,10 +112,70 @@ def test_mode_persistence(temp_dir):
     # Create and use mode
     mode1 = PrivateMode(storage_path=mode_path)
     mode1.process_document(Path(__file__).parent / "data" / "test.pdf")
+    mode1.flush()
     
     # Create new instance with same path
     mode2 = PrivateMode(storage_path=mode_path)
     
     # Search should work in new instance
     results = mode2.search("test")
-    assert len(results) > 0
\ No newline at end of file
+    assert len(results) > 0
+    
+def test_document_saved_on_flush(temp_dir, monkeypatch):
+    """Test that an ingested document is on disk for the next instance after flush()."""
+    def extract_chunks(self, file_path, metadata, digest=None):
+        metadata = dict(metadata or {}, mode=self.MODE_NAME, filename=file_path.name)
+        return ["Текст сохранённого документа"], metadata
+    
+    monkeypatch.setattr(PrivateMode, "_extract_chunks", extract_chunks)
+    mode_path = temp_dir / "test_mode"
+    
+    mode = PrivateMode(storage_path=mode_path)
+    mode.process_document(Path(__file__).parent / "data" / "test.pdf")
+    assert mode._dirty
+    
+    mode.flush()
+    assert len(PrivateMode(storage_path=mode_path).store.texts) == 1
+    
+def test_batch_counts_only_new_chunks(temp_dir, monkeypatch):
+    """Test that batch results count the chunks each document actually added."""
+    def extract_chunks(self, file_path, metadata, digest=None):
+        metadata = dict(metadata or {}, mode=self.MODE_NAME, filename=file_path.name)
+        return ["Общий фрагмент", f"Фрагмент {file_path.stem}"], metadata
+        
+    monkeypatch.setattr(PrivateMode, "_extract_chunks", extract_chunks)
+    files = []
+    for name in ("first", "second"):
+        path = temp_dir / f"{name}.pdf"
+        path.write_bytes(name.encode())
+        files.append(path)
+        
+    mode = PrivateMode(storage_path=temp_dir / "test_mode")
+    results = mode.process_document_batch(files)
+    
+    assert [result["chunks"] for result in results] == [2, 1]
+    assert len(mode.store.texts) == 3
+    assert all(hit.digest in mode.store.digests for hit in mode.search("фрагмент", k=3))
+    
+def test_batch_skips_repeated_files(temp_dir, monkeypatch):
+    """Test that identical files in one batch are processed once."""
+    extracted = []
+    
+    def extract_chunks(self, file_path, metadata, digest=None):
+        extracted.append(file_path.name)
+        metadata = dict(metadata or {}, mode=self.MODE_NAME, filename=file_path.name)
+        return [f"Фрагмент {file_path.stem}"], metadata
+        
+    monkeypatch.setattr(PrivateMode, "_extract_chunks", extract_chunks)
+    files = []
+    for name in ("original", "copy"):
+        path = temp_dir / f"{name}.pdf"
+        path.write_bytes(b"same content")
+        files.append(path)
+        
+    mode = PrivateMode(storage_path=temp_dir / "test_mode")
+    results = mode.process_document_batch(files)
+    
+    assert extracted == ["original.pdf"]
+    assert results[1]["duplicate"] is True
+    assert results[1]["chunks"] == results[0]["chunks"] == 1
@@ -61,6 +61,44 @@ def test_metadata_filtering(temp_dir):
     assert len(results) == 1
     assert "грипп" in results[0][0].lower()
     
+def test_shared_metadata(temp_dir):
+    """Test that a single metadata dict is shared by all chunks."""
+    store = FAISSStore()
+    
+    metadata = {"disease": "asthma"}
+    store.add_texts(["Первый фрагмент", "Второй фрагмент"], metadata)
+    
+    assert store.metadata == [metadata, metadata]
+    
+    results = store.similarity_search("фрагмент", k=2, filter_dict={"disease": "asthma"})
+    assert len(results) == 2
+    
+def test_metadata_interning(temp_dir):
+    """Test that consecutive equal metadata dicts are stored once."""
+    store = FAISSStore()
+    
+    store.add_texts(
+        ["Первый фрагмент", "Второй фрагмент", "Третий фрагмент"],
+        [{"disease": "asthma"}, {"disease": "asthma"}, {"disease": "copd"}]
+    )
+    
+    assert store.metadata[0] is store.metadata[1]
+    assert store.metadata[2] == {"disease": "copd"}
+    
+def test_retain(temp_dir):
+    """Test dropping entries by metadata without re-embedding."""
+    store = FAISSStore()
+    
+    texts = ["Локальный документ", "Облачный документ"]
+    store.add_texts(texts, [{"mode": "local"}, {"mode": "cloud"}])
+    
+    assert store.retain(lambda meta: meta["mode"] == "local") == 1
+    assert store.texts == [texts[0]]
+    assert store.index.ntotal == 1
+    
+    results = store.similarity_search(texts[0], k=2)
+    assert [result[0] for result in results] == [texts[0]]
+    
 def test_save_and_load(temp_dir):
     """Test saving and loading the vector store."""
     store = FAISSStore()
@@ -98,6 +136,59 @@ def test_batch_processing(temp_dir):
     results = store.similarity_search("тестовый", k=100)
     assert len(results) == 100
     
+def test_cosine_scores(temp_dir):
+    """Test that the default inner-product index returns cosine scores."""
+    store = FAISSStore()
+    
+    texts = ["Текст для проверки косинусного сходства"]
+    store.add_texts(texts)
+    
+    results = store.similarity_search(texts[0], k=1)
+    
+    assert len(results) == 1
+    assert results[0][2] == pytest.approx(1.0, abs=1e-4)
+    
+def test_min_score_filtering(temp_dir):
+    """Test that results below min_score are dropped."""
+    store = FAISSStore()
+    
+    texts = ["Одышка при нагрузке", "Боль в правом подреберье"]
+    store.add_texts(texts)
+    
+    results = store.similarity_search(texts[0], k=2, min_score=0.99)
+    
+    assert [result[0] for result in results] == [texts[0]]
+    
+def test_min_score_on_l2_index(temp_dir):
+    """Test that min_score also filters results of L2 indexes."""
+    store = FAISSStore(index_type="L2")
+    
+    texts = ["Одышка при нагрузке", "Боль в правом подреберье"]
+    store.add_texts(texts)
+    
+    results = store.similarity_search(texts[0], k=2)
+    threshold = max(score for _, _, score in results)
+    
+    filtered = store.similarity_search(texts[0], k=2, min_score=threshold)
+    assert [score for _, _, score in filtered] == [threshold]
+    
+def test_batch_search(temp_dir):
+    """Test searching several queries in one call."""
+    store = FAISSStore()
+    
+    texts = [f"Тестовый текст номер {i}" for i in range(10)]
+    store.add_texts(texts)
+    
+    queries = ["тестовый", "номер", "текст"]
+    batch_results = store.similarity_search_batch(queries, k=3)
+    
+    assert len(batch_results) == len(queries)
+    for query, results in zip(queries, batch_results):
+        # BLAS may round batched and single-query scores differently
+        expected = store.similarity_search(query, k=3)
+        assert [(text, meta) for text, meta, _ in results] == [(text, meta) for text, meta, _ in expected]
+        assert [score for _, _, score in results] == pytest.approx([score for _, _, score in expected])
+    
 def test_error_handling(temp_dir):
     """Test error handling."""
     store = FAISSStore()
@@ -112,4 +203,16 @@ def test_error_handling(temp_dir):
         
     # Test invalid save path
     with pytest.raises(Exception):
-        store.save_local("/nonexistent/path/store")
\ No newline at end of file
+        store.save_local("/nonexistent/path/store")
+        
+def test_duplicate_chunks_skipped(temp_dir):
+    """Test that re-ingested chunks add no new vectors."""
+    store = FAISSStore()
+    
+    texts = ["Повторяющийся фрагмент", "Уникальный фрагмент"]
+    store.add_texts(texts)
+    
+    assert store.add_texts([texts[0], texts[0]], skip_duplicates=True) == []
+    assert store.add_texts([texts[1], "Новый фрагмент", "Новый фрагмент"], skip_duplicates=True) == [2]
+    assert store.index.ntotal == 3
+    assert store.add_texts([texts[0]]) == [3]
\ No newline at end of file
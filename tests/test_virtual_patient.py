@@ -0,0 +1,72 @@
+"""
+Tests for virtual patient generation and scoring.
+"""
+import json
+import pytest
+from pathlib import Path
+from core.modules.virtual_patient import CaseGenerator
+from core.modules.virtual_patient.diagnostic_engine import DiagnosticEngine
+from core.modules.virtual_patient.patient_model import VitalSign
+
+@pytest.fixture(scope="function")
+def case_generator(temp_dir):
+    """Case generator with basic templates in temporary storage."""
+    return CaseGenerator(templates_path=temp_dir / "templates", seed=42)
+
+def test_batch_rows_are_stable(case_generator):
+    """Test that indexing a batch row twice returns the same patient."""
+    batch = case_generator.generate_batch(8)
+    
+    assert batch[3] is batch[3]
+    assert batch[-1] is batch[7]
+    assert batch[3].name == batch[3].name
+    
+    with pytest.raises(IndexError):
+        batch[8]
+    
+def test_paired_vital_sign_status():
+    """Test that blood pressure ranges apply to the systolic reading."""
+    vital = VitalSign("Blood Pressure", "185.0/95.0", "mmHg", 90, 140, 80, 180)
+    assert vital.get_status() == "critical_high"
+    
+    vital.update("120.0/80.0")
+    assert vital.get_status() == "normal"
+    assert vital.trend == "decreasing"
+    
+def test_generate_and_save_cases(case_generator, temp_dir):
+    """Test generating cases and saving them, in process and in worker processes."""
+    patient = case_generator.generate_case()
+    saved_path = case_generator.save_patient_to_file(patient, temp_dir / "single")
+    saved = json.loads(Path(saved_path).read_text(encoding="utf-8"))
+    assert saved["patient_id"] == patient.patient_id
+    
+    paths = case_generator.batch_generate(4, temp_dir / "batch", workers=2)
+    assert len(paths) == 4
+    assert len(list((temp_dir / "batch").glob("*.json"))) == 4
+    
+def test_diagnostic_score_matches_patient_scoring():
+    """Test that the engine scores diagnoses like VirtualPatient.evaluate_diagnosis."""
+    engine = DiagnosticEngine()
+    actual = {"Pneumonia": 0.8, "Bronchitis": 0.15, "Tuberculosis": 0.05}
+    
+    assert engine._calculate_score(actual, {"Pneumonia": 0.8}) == pytest.approx(80.0)
+    assert engine._calculate_score(actual, dict(actual)) == pytest.approx(100.0)
+    assert engine._calculate_score(actual, {"Asthma": 0.9}) == 0.0
+    
+def test_deferred_results_reproducible(temp_dir):
+    """Test that seeded patients do not depend on when their lab results are read."""
+    def lab_values(patient):
+        return {name: result.value for name, result in patient._potential_lab_results.items()}
+        
+    first = CaseGenerator(templates_path=temp_dir / "first", seed=7)
+    early = first.generate_case(specialty="cardiology")
+    early_labs = lab_values(early)
+    early_next = first.generate_case(specialty="cardiology")
+    
+    second = CaseGenerator(templates_path=temp_dir / "second", seed=7)
+    late = second.generate_case(specialty="cardiology")
+    late_next = second.generate_case(specialty="cardiology")
+    
+    assert lab_values(late) == early_labs
+    assert late_next.name == early_next.name
+    assert lab_values(late_next) == lab_values(early_next)